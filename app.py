@@ -371,35 +371,28 @@ def main() -> None:
             # ========================================
             st.markdown("<br>", unsafe_allow_html=True)
             st.header("Key Performance Indicators")
-            kpi_col1, kpi_col2, kpi_col3, kpi_col4 = st.columns(4)
-
-            with kpi_col1:
-                DashboardComponents.render_kpi_card(
+            DashboardComponents.render_kpi_row([
+                dict(
                     title="Total Revenue",
                     value=kpis['total_revenue'],
                     format_string="${:,.2f}"
-                )
-
-            with kpi_col2:
-                DashboardComponents.render_kpi_card(
+                ),
+                dict(
                     title="Total Quantity Sold",
                     value=kpis['total_quantity'],
                     format_string="{:,.0f}"
-                )
-
-            with kpi_col3:
-                DashboardComponents.render_kpi_card(
+                ),
+                dict(
                     title="Avg Transaction Value",
                     value=kpis['avg_transaction_value'],
                     format_string="${:,.2f}"
-                )
-
-            with kpi_col4:
-                DashboardComponents.render_kpi_card(
+                ),
+                dict(
                     title="Number of Transactions",
                     value=kpis['num_transactions'],
                     format_string="{:,.0f}"
-                )
+                ),
+            ])
 
             # Dataset info below KPIs
             st.markdown("---")
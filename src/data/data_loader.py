@@ -69,6 +69,7 @@ class DataLoader:
         """
         self.data_path = data_path
         self.df: Optional[pd.DataFrame] = None
+        self._numeric_view: Optional[pd.DataFrame] = None
         logger.info(f"DataLoader initialized with path: {data_path}")
 
     def load_data(self) -> pd.DataFrame:
@@ -96,6 +97,13 @@ class DataLoader:
         logger.info("Starting CSV ingestion process")
         logger.info("=" * 60)
 
+        # Step 0: Try loading from the Parquet cache of a previous run
+        if self._load_from_cache():
+            logger.info("=" * 60)
+            logger.info("Ingestion completed from Parquet cache")
+            logger.info("=" * 60)
+            return self.df
+
         # Step 1: Verify file exists
         self._verify_file_exists()
 
@@ -114,15 +122,139 @@ class DataLoader:
         # Step 6: Convert and validate dates
         self._convert_dates()
 
+        # Step 6b: Downcast numeric columns to cut memory bandwidth
+        self._optimize_dtypes()
+
         # Step 7: Log dataset statistics
         self._log_dataset_stats()
 
+        # Step 8: Persist validated data to Parquet for fast reloads
+        self._write_cache()
+
         logger.info("=" * 60)
         logger.info("CSV ingestion completed successfully")
         logger.info("=" * 60)
 
         return self.df
 
+    def _cache_path(self) -> Path:
+        """
+        Get the Parquet cache path derived from the CSV data path.
+
+        Returns:
+            Path: Cache file path (same location, .parquet extension)
+        """
+        return Path(self.data_path).with_suffix('.parquet')
+
+    def _load_from_cache(self) -> bool:
+        """
+        Load data from the Parquet cache if it is newer than the CSV.
+
+        The cache holds fully validated data with final dtypes (including
+        parsed dates), so validation and date conversion can be skipped.
+        Any cache read error falls back to the full CSV pipeline.
+
+        Returns:
+            bool: True if data was loaded from cache, False otherwise
+        """
+        cache_path = self._cache_path()
+
+        if not cache_path.exists() or not os.path.exists(self.data_path):
+            return False
+
+        if cache_path.stat().st_mtime <= os.path.getmtime(self.data_path):
+            logger.info("Parquet cache is stale, re-running full ingestion")
+            return False
+
+        try:
+            self.df = pd.read_parquet(cache_path)
+            # The cache is written post-sort, but attrs don't survive Parquet
+            self.df.attrs['date_sorted'] = True
+            logger.info(
+                f"Loaded {len(self.df):,} rows from Parquet cache: {cache_path}"
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to read Parquet cache ({e}), falling back to CSV")
+            return False
+
+    def _write_cache(self) -> None:
+        """
+        Write validated data to the Parquet cache.
+
+        Cache write failures are non-fatal: the next run simply re-ingests
+        the CSV (e.g. when pyarrow is not installed or the location is
+        read-only).
+        """
+        cache_path = self._cache_path()
+        try:
+            self.df.to_parquet(cache_path, compression='zstd')
+            logger.info(f"Wrote Parquet cache: {cache_path}")
+        except Exception as e:
+            logger.warning(f"Failed to write Parquet cache ({e}), skipping")
+
+    def load_filtered(
+        self,
+        product_ids: Optional[list] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Load data with filters pushed down into the Parquet cache scan.
+
+        When the Parquet cache is fresh, the predicates are handed to the
+        pyarrow reader, which evaluates them per row group on multiple
+        threads and skips groups whose statistics rule them out — only
+        matching rows are ever materialized. Without a fresh cache this
+        falls back to full ingestion plus in-memory filtering.
+
+        Args:
+            product_ids (Optional[list]): Product IDs to include (None = all)
+            start_date (Optional[str]): Inclusive start date (None = open)
+            end_date (Optional[str]): Inclusive end date (None = open)
+
+        Returns:
+            pd.DataFrame: Validated invoice data restricted to the filters
+        """
+        cache_path = self._cache_path()
+        cache_fresh = (
+            cache_path.exists()
+            and os.path.exists(self.data_path)
+            and cache_path.stat().st_mtime > os.path.getmtime(self.data_path)
+        )
+
+        if cache_fresh:
+            filters = []
+            if product_ids is not None:
+                filters.append(('product_id', 'in', list(product_ids)))
+            if start_date is not None:
+                filters.append(('invoice_date', '>=', pd.Timestamp(start_date)))
+            if end_date is not None:
+                filters.append(('invoice_date', '<=', pd.Timestamp(end_date)))
+
+            try:
+                df = pd.read_parquet(cache_path, filters=filters or None)
+                # The cache is written post-sort, but attrs don't survive Parquet
+                df.attrs['date_sorted'] = True
+                logger.info(
+                    "load_filtered: %d rows from pushed-down Parquet scan", len(df)
+                )
+                return df
+            except Exception as e:
+                logger.warning(
+                    f"Pushed-down Parquet scan failed ({e}), "
+                    f"falling back to in-memory filtering"
+                )
+
+        df = self.df if self.df is not None else self.load_data()
+        if product_ids is not None:
+            df = df[df['product_id'].isin(product_ids)]
+        if start_date is not None:
+            df = df[df['invoice_date'] >= pd.Timestamp(start_date)]
+        if end_date is not None:
+            df = df[df['invoice_date'] <= pd.Timestamp(end_date)]
+        return df
+
     def _verify_file_exists(self) -> None:
         """
         Verify that the CSV file exists at the specified path.
@@ -151,6 +283,7 @@ class DataLoader:
         """
         try:
             logger.info("Reading CSV file...")
+            self._numeric_view = None
             self.df = pd.read_csv(self.data_path)
 
             if self.df.empty:
@@ -172,6 +305,29 @@ class DataLoader:
             logger.error(error_msg)
             raise Exception(error_msg)
 
+    def _coerced_numeric_columns(self) -> Optional[pd.DataFrame]:
+        """
+        Get the numeric columns coerced to numeric dtype, computed once.
+
+        Type validation and business-rule validation both need the coerced
+        values, so the conversion result is cached on the instance to avoid
+        sweeping the same columns multiple times per ingestion.
+
+        Returns:
+            Optional[pd.DataFrame]: Coerced numeric columns, or None if
+                none of the expected numeric columns are present
+        """
+        if self._numeric_view is None:
+            numeric_columns = [
+                c for c in ['product_id', 'qty', 'amount'] if c in self.df.columns
+            ]
+            if not numeric_columns:
+                return None
+            self._numeric_view = self.df[numeric_columns].apply(
+                pd.to_numeric, errors='coerce'
+            )
+        return self._numeric_view
+
     def _validate_schema(self) -> None:
         """
         Validate that all required columns exist in the dataset.
@@ -206,10 +362,11 @@ class DataLoader:
 
         errors = []
 
-        # Validate numeric columns
-        for col in ['product_id', 'qty', 'amount']:
-            if col in self.df.columns:
-                non_numeric = pd.to_numeric(self.df[col], errors='coerce').isna().sum()
+        # Validate numeric columns in one batched pass instead of per-column scans
+        coerced = self._coerced_numeric_columns()
+        if coerced is not None:
+            non_numeric_counts = coerced.isna().sum()
+            for col, non_numeric in non_numeric_counts.items():
                 if non_numeric > 0:
                     errors.append(
                         f"Column '{col}': {non_numeric} non-numeric values found"
@@ -242,28 +399,25 @@ class DataLoader:
         warnings = []
         errors = []
 
-        # Check for missing values in required columns
-        for col in self.REQUIRED_COLUMNS:
-            null_count = self.df[col].isnull().sum()
+        # Check for missing values in required columns (single vectorized scan)
+        null_counts = self.df[self.REQUIRED_COLUMNS].isna().sum()
+        for col, null_count in null_counts.items():
             if null_count > 0:
                 errors.append(
                     f"Column '{col}': {null_count} missing values ({null_count/len(self.df)*100:.2f}%)"
                 )
 
-        # Validate business rules
-        if 'qty' in self.df.columns:
-            invalid_qty = (pd.to_numeric(self.df['qty'], errors='coerce') <= 0).sum()
-            if invalid_qty > 0:
-                errors.append(
-                    f"Column 'qty': {invalid_qty} records with quantity <= 0"
-                )
-
-        if 'amount' in self.df.columns:
-            invalid_amount = (pd.to_numeric(self.df['amount'], errors='coerce') <= 0).sum()
-            if invalid_amount > 0:
-                errors.append(
-                    f"Column 'amount': {invalid_amount} records with amount <= 0"
-                )
+        # Validate business rules against the shared coerced numeric view,
+        # reusing the coercion already done for type validation
+        coerced = self._coerced_numeric_columns()
+        if coerced is not None:
+            for col, label in (('qty', 'quantity'), ('amount', 'amount')):
+                if col in coerced.columns:
+                    invalid_count = (coerced[col] <= 0).sum()
+                    if invalid_count > 0:
+                        errors.append(
+                            f"Column '{col}': {invalid_count} records with {label} <= 0"
+                        )
 
         # Check for duplicate rows
         duplicate_count = self.df.duplicated().sum()
@@ -318,6 +472,11 @@ class DataLoader:
             if future_dates > 0:
                 logger.warning(f"Found {future_dates} records with future dates")
 
+            # Keep rows chronologically ordered so date-range filters can
+            # binary-search slice bounds instead of scanning every row
+            self.df = self.df.sort_values('invoice_date', ignore_index=True)
+            self.df.attrs['date_sorted'] = True
+
             logger.info("Date conversion completed successfully")
 
         except DataValidationError:
@@ -327,6 +486,31 @@ class DataLoader:
             logger.error(error_msg)
             raise DataValidationError(error_msg)
 
+    def _optimize_dtypes(self) -> None:
+        """
+        Downcast numeric columns to narrower dtypes.
+
+        qty and product_id fit comfortably in int32, and float32's ~7
+        significant digits are ample for single-currency unit amounts.
+        Halving element width halves the bytes moved by every downstream
+        scan; aggregations accumulate in wider types where precision
+        matters.
+        """
+        self.df['qty'] = self.df['qty'].astype('int32')
+        self.df['product_id'] = self.df['product_id'].astype('int32')
+        self.df['amount'] = self.df['amount'].astype('float32')
+
+        # Materialize line totals once so every downstream revenue
+        # computation is a single column reduction instead of a fresh
+        # qty*amount multiply per call
+        self.df['total_amount'] = (
+            self.df['qty'].astype('float32') * self.df['amount']
+        )
+        logger.info(
+            "Downcast numeric columns: qty/product_id -> int32, amount -> float32; "
+            "precomputed total_amount"
+        )
+
     def _log_dataset_stats(self) -> None:
         """
         Log comprehensive dataset statistics.
@@ -353,8 +537,9 @@ class DataLoader:
         unique_customers = self.df['email'].nunique()
         logger.info(f"Unique Customers: {unique_customers}")
 
-        # Revenue stats
-        total_revenue = (self.df['qty'] * self.df['amount']).sum()
+        # Revenue stats (total_amount is materialized by _optimize_dtypes,
+        # so no qty*amount temporary is needed here)
+        total_revenue = self.df['total_amount'].sum()
         total_quantity = self.df['qty'].sum()
         logger.info(f"Total Revenue: ${total_revenue:,.2f}")
         logger.info(f"Total Quantity Sold: {total_quantity:,}")
@@ -392,9 +577,9 @@ class DataLoader:
             },
             'unique_products': self.df['product_id'].nunique(),
             'unique_customers': self.df['email'].nunique(),
-            'total_revenue': (self.df['qty'] * self.df['amount']).sum(),
+            'total_revenue': self.df['total_amount'].sum(),
             'total_quantity': self.df['qty'].sum(),
-            'avg_transaction_value': (self.df['qty'] * self.df['amount']).mean(),
+            'avg_transaction_value': self.df['total_amount'].mean(),
             'missing_values': self.df.isnull().sum().to_dict(),
             'duplicate_rows': self.df.duplicated().sum()
         }
@@ -10,7 +10,8 @@ Responsible for:
 
 import pandas as pd
 import numpy as np
-from typing import List, Optional
+from functools import cached_property
+from typing import List, Optional, Tuple
 
 
 class DataTransformer:
@@ -47,8 +48,8 @@ class DataTransformer:
         """
         # Customer full name
         if 'full_name' not in self.df.columns:
-            self.df['full_name'] = (
-                self.df['first_name'] + ' ' + self.df['last_name']
+            self.df['full_name'] = self._concat_names(
+                self.df['first_name'], self.df['last_name']
             )
 
         # Total transaction amount
@@ -63,6 +64,113 @@ class DataTransformer:
         if 'invoice_day' not in self.df.columns:
             self.df['invoice_day'] = self.df['invoice_date'].dt.day
 
+        # Low-cardinality filter keys as dictionary-encoded categoricals:
+        # membership tests and groupbys then work on small integer codes
+        # instead of full-width int64 lanes
+        for key_col in ('invoice_year', 'product_id'):
+            if self.df[key_col].dtype.name != 'category':
+                # Ordered so min/max and comparisons keep working downstream
+                self.df[key_col] = self.df[key_col].astype(
+                    pd.CategoricalDtype(sorted(self.df[key_col].unique()), ordered=True)
+                )
+
+        # Emails repeat heavily across invoices; as a categorical, unique-
+        # customer counts hash small integer codes instead of strings
+        if self.df['email'].dtype.name != 'category':
+            self.df['email'] = self.df['email'].astype('category')
+
+        # Cache the unique filter-key sets on the frame so consumers (e.g.
+        # filter diagnostics) don't need an O(N) unique() scan per call
+        self.df.attrs['years_set'] = frozenset(self.df['invoice_year'].cat.categories)
+        self.df.attrs['products_set'] = frozenset(self.df['product_id'].cat.categories)
+
+    @staticmethod
+    def _concat_names(first: pd.Series, last: pd.Series):
+        """
+        Concatenate name columns into a single full-name array.
+
+        Prefers pyarrow's columnar string join, which builds one contiguous
+        UTF-8 buffer instead of allocating a Python string per row. Falls
+        back to plain Series concatenation when pyarrow is unavailable.
+
+        Args:
+            first (pd.Series): First-name column
+            last (pd.Series): Last-name column
+
+        Returns:
+            Array-like suitable for assignment as a DataFrame column
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+
+            joined = pc.binary_join_element_wise(
+                pa.array(first, type=pa.string()),
+                pa.array(last, type=pa.string()),
+                ' '
+            )
+            return pd.array(joined, dtype=pd.ArrowDtype(pa.string()))
+        except Exception:
+            return first + ' ' + last
+
+    @cached_property
+    def _gb_year(self):
+        """Shared groupby('invoice_year') reused by the yearly getters."""
+        return self.df.groupby('invoice_year', sort=True, observed=True)
+
+    @cached_property
+    def _gb_product(self):
+        """Shared groupby('product_id') reused by the product getters."""
+        return self.df.groupby('product_id', sort=False, observed=True)
+
+    @cached_property
+    def _gb_year_product(self):
+        """Shared groupby(['invoice_year', 'product_id']) for comparison views."""
+        return self.df.groupby(['invoice_year', 'product_id'], sort=False, observed=True)
+
+    @classmethod
+    def _from_already_transformed(cls, df: pd.DataFrame) -> 'DataTransformer':
+        """
+        Build a DataTransformer from a dataframe that already has derived fields.
+
+        Used internally by the filter methods: filtering preserves columns
+        and dtypes, so the defensive copy and derived-field pass in
+        __init__ can be skipped entirely.
+
+        Args:
+            df (pd.DataFrame): Already-transformed invoice data
+
+        Returns:
+            DataTransformer: New instance wrapping the dataframe as-is
+        """
+        obj = cls.__new__(cls)
+        obj.df = df
+        return obj
+
+    @staticmethod
+    def _membership_mask(column: pd.Series, values: List[int]) -> np.ndarray:
+        """
+        Build a boolean membership mask for a numeric column.
+
+        For small value sets (the common case with toggle-button filters)
+        an OR of vectorized equality comparisons beats isin's hash-set
+        probe; larger sets fall back to isin.
+
+        Args:
+            column (pd.Series): Numeric column to test
+            values (List[int]): Values to match
+
+        Returns:
+            np.ndarray: Boolean mask aligned with the column
+        """
+        if len(values) <= 4:
+            arr = column.to_numpy()
+            mask = np.zeros(len(arr), dtype=bool)
+            for value in values:
+                mask |= (arr == value)
+            return mask
+        return column.isin(values).to_numpy()
+
     def filter_by_years(self, years: List[int]) -> 'DataTransformer':
         """
         Filter data by selected years.
@@ -73,8 +181,11 @@ class DataTransformer:
         Returns:
             DataTransformer: New instance with filtered data
         """
-        filtered_df = self.df[self.df['invoice_year'].isin(years)]
-        return DataTransformer(filtered_df)
+        # "All years selected" is the default UI state — skip the scan entirely
+        if set(years) >= set(self.df['invoice_year'].cat.categories):
+            return self
+        mask = self._membership_mask(self.df['invoice_year'], years)
+        return DataTransformer._from_already_transformed(self.df[mask])
 
     def filter_by_products(self, product_ids: List[int]) -> 'DataTransformer':
         """
@@ -86,8 +197,10 @@ class DataTransformer:
         Returns:
             DataTransformer: New instance with filtered data
         """
-        filtered_df = self.df[self.df['product_id'].isin(product_ids)]
-        return DataTransformer(filtered_df)
+        if set(product_ids) >= set(self.df['product_id'].cat.categories):
+            return self
+        mask = self._membership_mask(self.df['product_id'], product_ids)
+        return DataTransformer._from_already_transformed(self.df[mask])
 
     def get_kpis(self) -> dict:
         """
@@ -96,11 +209,19 @@ class DataTransformer:
         Returns:
             dict: Dictionary containing all KPIs
         """
+        # Sum total_amount once and derive the mean from it, instead of
+        # scanning the column twice
+        total_revenue = float(np.add.reduce(
+            self.df['total_amount'].to_numpy(), dtype=np.float64
+        ))
+        num_transactions = len(self.df)
         return {
-            'total_revenue': self.df['total_amount'].sum(),
-            'total_quantity': self.df['qty'].sum(),
-            'num_transactions': len(self.df),
-            'avg_transaction_value': self.df['total_amount'].mean(),
+            'total_revenue': total_revenue,
+            'total_quantity': int(self.df['qty'].sum()),
+            'num_transactions': num_transactions,
+            'avg_transaction_value': (
+                total_revenue / num_transactions if num_transactions else 0.0
+            ),
             'unique_customers': self.df['email'].nunique(),
             'unique_products': self.df['product_id'].nunique()
         }
@@ -112,11 +233,12 @@ class DataTransformer:
         Returns:
             pd.DataFrame: Yearly revenue with columns [invoice_year, total_revenue]
         """
-        yearly = self.df.groupby('invoice_year').agg({
-            'total_amount': 'sum'
-        }).reset_index()
+        yearly = self._gb_year['total_amount'].sum().reset_index()
         yearly.columns = ['invoice_year', 'total_revenue']
-        return yearly.sort_values('invoice_year')
+        # Cast the (tiny) aggregate back to full-width dtypes for consumers
+        yearly['invoice_year'] = yearly['invoice_year'].astype('int64')
+        yearly['total_revenue'] = yearly['total_revenue'].astype('float64')
+        return yearly
 
     def get_yearly_quantity(self) -> pd.DataFrame:
         """
@@ -125,11 +247,37 @@ class DataTransformer:
         Returns:
             pd.DataFrame: Yearly quantity with columns [invoice_year, total_quantity]
         """
-        yearly = self.df.groupby('invoice_year').agg({
-            'qty': 'sum'
-        }).reset_index()
+        yearly = self._gb_year['qty'].sum().reset_index()
         yearly.columns = ['invoice_year', 'total_quantity']
-        return yearly.sort_values('invoice_year')
+        yearly['invoice_year'] = yearly['invoice_year'].astype('int64')
+        return yearly
+
+    @cached_property
+    def _top_product_sums(self) -> pd.Series:
+        """
+        Compute per-product revenue sums as a Series indexed by product_id.
+
+        Internal helper shared by the top-product getters, computed once per
+        instance. Working on a Series keeps nlargest on the fast
+        partial-partition path and avoids building intermediate DataFrames.
+
+        Returns:
+            pd.Series: Total revenue per product, indexed by product_id
+        """
+        return self._gb_product['total_amount'].sum()
+
+    def data_fingerprint(self) -> Tuple[int, float]:
+        """
+        Return a cheap token identifying the underlying data.
+
+        Used as a cache key by callers that memoize derived results across
+        Streamlit reruns: a row count plus the revenue total is a single
+        vectorized pass and changes whenever the loaded data does.
+
+        Returns:
+            Tuple[int, float]: (row count, total revenue sum)
+        """
+        return len(self.df), float(self.df['total_amount'].sum())
 
     def get_top_products(self, n: int = 10) -> pd.DataFrame:
         """
@@ -141,11 +289,12 @@ class DataTransformer:
         Returns:
             pd.DataFrame: Top products with columns [product_id, total_revenue]
         """
-        top_products = self.df.groupby('product_id').agg({
-            'total_amount': 'sum'
-        }).reset_index()
-        top_products.columns = ['product_id', 'total_revenue']
-        return top_products.nlargest(n, 'total_revenue')
+        return (
+            self._top_product_sums
+            .nlargest(n)
+            .rename_axis('product_id')
+            .reset_index(name='total_revenue')
+        )
 
     def get_top_products_for_filter(self, n: int = 15) -> List[int]:
         """
@@ -160,8 +309,7 @@ class DataTransformer:
         Returns:
             List[int]: Sorted list of product IDs ordered by revenue (highest first)
         """
-        top = self.get_top_products(n)
-        return top['product_id'].tolist()
+        return self._top_product_sums.nlargest(n).index.tolist()
 
     def get_product_year_heatmap_data(self) -> pd.DataFrame:
         """
@@ -176,7 +324,8 @@ class DataTransformer:
             columns='invoice_year',       # X-axis: Years
             values='total_amount',        # Color: Revenue
             aggfunc='sum',
-            fill_value=0
+            fill_value=0,
+            observed=True                 # Skip unobserved category levels
         )
         return heatmap_data
 
@@ -222,37 +371,28 @@ class DataTransformer:
         if 'invoice_date' not in self.df.columns:
             raise ValueError("invoice_date column not found in dataframe")
 
-        # Ensure we have a datetime index
-        df_temp = self.df.copy()
-        df_temp = df_temp.set_index('invoice_date')
-
-        # Count transactions per original date
-        daily_counts = df_temp.resample('D').size()
-
-        # Resample to requested frequency
+        # Map freq to a pandas resample rule ('W' anchored to Sunday)
         if freq == 'D':
-            # Already daily, just ensure continuous range
-            result = daily_counts
+            rule = 'D'
         elif freq == 'W':
-            # Weekly aggregation (Sunday start)
-            result = daily_counts.resample('W-SUN').sum()
+            rule = 'W-SUN'
         elif freq == 'M':
-            # Monthly aggregation (end of month)
-            # Use 'M' for pandas <2.0 compatibility, pandas will handle it
-            try:
-                result = daily_counts.resample('ME').sum()
-            except ValueError:
-                # Fallback for older pandas versions
-                result = daily_counts.resample('M').sum()
+            rule = 'ME'
         else:
             raise ValueError(f"Invalid frequency: {freq}. Use 'D', 'W', or 'M'.")
 
-        # Convert to DataFrame
-        result_df = result.reset_index()
-        result_df.columns = ['date', 'volume']
+        # Count transactions in a single resample over a date-indexed view.
+        # No dataframe copy and no intermediate daily aggregation: summing a
+        # Series of ones yields per-period counts with gaps filled as 0.
+        counts = pd.Series(1, index=pd.DatetimeIndex(self.df['invoice_date']))
+        try:
+            result = counts.resample(rule).sum()
+        except ValueError:
+            # Fallback for pandas versions without the 'ME' alias
+            result = counts.resample('M').sum()
 
-        # Fill any remaining NaN values with 0
-        result_df['volume'] = result_df['volume'].fillna(0).astype(int)
+        result_df = result.rename_axis('date').reset_index(name='volume')
+        result_df['volume'] = result_df['volume'].astype(int)
 
         return result_df
 
@@ -268,7 +408,7 @@ class DataTransformer:
         """
         product_data = self.df[self.df['product_id'] == product_id]
 
-        performance = product_data.groupby('invoice_year').agg({
+        performance = product_data.groupby('invoice_year', observed=True).agg({
             'total_amount': 'sum',
             'qty': 'sum'
         }).reset_index()
@@ -293,18 +433,16 @@ class DataTransformer:
                 - product_id: Product identifier
                 - revenue: Total revenue for that product in that year
         """
-        # Use all products in filtered data if not specified
+        # Reuse the shared grouper when no product subset is requested
         if product_ids is None:
-            product_ids = self.df['product_id'].unique().tolist()
-
-        # Filter to requested products only
-        filtered_df = self.df[self.df['product_id'].isin(product_ids)]
-
-        # Group by year and product
-        performance = filtered_df.groupby(['invoice_year', 'product_id']).agg({
-            'total_amount': 'sum'
-        }).reset_index()
+            grouped = self._gb_year_product['total_amount'].sum()
+        else:
+            filtered_df = self.df[self.df['product_id'].isin(product_ids)]
+            grouped = filtered_df.groupby(
+                ['invoice_year', 'product_id'], sort=False, observed=True
+            )['total_amount'].sum()
 
+        performance = grouped.reset_index()
         performance.columns = ['invoice_year', 'product_id', 'revenue']
 
         return performance.sort_values(['invoice_year', 'product_id'])
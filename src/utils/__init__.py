@@ -10,20 +10,24 @@ from .filters import (
     filter_by_products,
     filter_by_date_range,
     apply_combined_filters,
+    build_combined_mask,
     FilterError
 )
 from .kpis import (
+    ensure_total_amount,
     calculate_total_revenue,
     calculate_total_quantity,
     calculate_average_transaction_value,
     calculate_num_transactions,
     calculate_all_kpis,
+    calculate_filtered_kpis,
     calculate_unique_customers,
     calculate_unique_products,
     calculate_kpis_for_year,
     calculate_kpis_with_yoy_comparison,
     get_available_years,
-    KPIError
+    KPIError,
+    KPIResult
 )
 
 __all__ = [
@@ -36,18 +40,22 @@ __all__ = [
     'filter_by_products',
     'filter_by_date_range',
     'apply_combined_filters',
+    'build_combined_mask',
     'FilterError',
     # KPI functions
+    'ensure_total_amount',
     'calculate_total_revenue',
     'calculate_total_quantity',
     'calculate_average_transaction_value',
     'calculate_num_transactions',
     'calculate_all_kpis',
+    'calculate_filtered_kpis',
     'calculate_unique_customers',
     'calculate_unique_products',
     # Period-over-period comparison functions
     'calculate_kpis_for_year',
     'calculate_kpis_with_yoy_comparison',
     'get_available_years',
-    'KPIError'
+    'KPIError',
+    'KPIResult'
 ]
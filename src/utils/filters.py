@@ -5,14 +5,29 @@ This module provides reusable filtering functions for invoice data.
 Designed to be used by KPIs, charts, and other data consumers.
 
 All functions handle edge cases gracefully and return clean DataFrames.
+Returned frames are never defensively copied: boolean indexing already
+produces a new frame, and no-op filters hand back the input unchanged,
+so callers should not mutate results in place.
 """
 
 import pandas as pd
+import numpy as np
 import logging
+import weakref
+from collections import OrderedDict
 from typing import List, Optional, Union
 
 logger = logging.getLogger(__name__)
 
+# Small LRU cache of combined-filter masks. Dashboard reruns frequently
+# re-request the same year/product/date combination on the same frame, so
+# the mask (not the sliced frame) is kept keyed on the frame's identity
+# and the normalized filter parameters. Entries are evicted via
+# weakref.finalize when the frame is garbage collected, so a recycled
+# object id can never apply another frame's mask.
+_mask_cache: 'OrderedDict[tuple, np.ndarray]' = OrderedDict()
+_MASK_CACHE_MAXSIZE = 32
+
 
 class FilterError(Exception):
     """Custom exception for filtering errors."""
@@ -76,60 +91,84 @@ def filter_by_years(
 
     # Handle None (no filtering)
     if years is None:
-        logger.info("filter_by_years: No year filter applied (years=None)")
-        return df.copy()
+        logger.debug("filter_by_years: No year filter applied (years=None)")
+        return df
 
     # Convert range to list
     if isinstance(years, range):
         years = list(years)
-        logger.debug(f"filter_by_years: Converted range to list: {years}")
+        logger.debug("filter_by_years: Converted range to list: %s", years)
 
     # Handle empty list (return empty DataFrame with same schema)
     if not years:
-        logger.info("filter_by_years: Empty year list, returning empty DataFrame")
-        return df.iloc[0:0].copy()  # Empty DataFrame with same columns
+        logger.debug("filter_by_years: Empty year list, returning empty DataFrame")
+        return df.iloc[0:0]  # Empty DataFrame with same columns
 
-    # Validate year values
-    if not all(isinstance(year, int) for year in years):
+    # Validate year values via a single typed-array cast: one dtype check
+    # replaces per-element isinstance calls, and the array feeds np.isin below
+    years_arr = np.asarray(years)
+    if years_arr.dtype.kind not in 'iu':
         error_msg = "All year values must be integers"
         logger.error(f"filter_by_years: {error_msg}")
         raise ValueError(error_msg)
+    years_arr = years_arr.astype(np.int64, copy=False)
 
     # Check for invalid years (negative or unrealistic)
-    invalid_years = [y for y in years if y < 1900 or y > 2100]
-    if invalid_years:
-        logger.warning(
-            f"filter_by_years: Potentially invalid years detected: {invalid_years}"
-        )
-
-    # Get available years in the dataset
-    available_years = df[year_column].unique()
-
-    # Check if any requested years exist in the data
-    requested_years_set = set(years)
-    available_years_set = set(available_years)
-    matching_years = requested_years_set & available_years_set
-    missing_years = requested_years_set - available_years_set
-
-    if missing_years:
-        logger.warning(
-            f"filter_by_years: {len(missing_years)} requested years not found in data: "
-            f"{sorted(missing_years)}"
-        )
-
-    if not matching_years:
+    invalid_years = years_arr[(years_arr < 1900) | (years_arr > 2100)]
+    if invalid_years.size:
         logger.warning(
-            f"filter_by_years: None of the requested years exist in the dataset. "
-            f"Requested: {sorted(years)}, Available: {sorted(available_years)}"
+            f"filter_by_years: Potentially invalid years detected: {invalid_years.tolist()}"
         )
-        return df.iloc[0:0].copy()  # Empty DataFrame with same columns
-
-    # Perform filtering
-    filtered_df = df[df[year_column].isin(years)].copy()
 
-    logger.info(
-        f"filter_by_years: Filtered {len(df):,} -> {len(filtered_df):,} rows "
-        f"({len(matching_years)} years: {sorted(matching_years)})"
+    # Short-circuit the common "all years selected" case: when the request
+    # covers every year present (per the load-time cache), filtering is a no-op
+    cached_years = df.attrs.get('years_set')
+    if cached_years and set(years) >= cached_years:
+        logger.debug("filter_by_years: Requested years cover all data, no filtering needed")
+        return df
+
+    # Requested-vs-available diagnostics need a full unique() scan, so only
+    # compute them when debug logging is on — they don't affect the result
+    if logger.isEnabledFor(logging.DEBUG):
+        # Prefer the unique-value cache stamped on the frame at load time;
+        # fall back to a scan for frames built elsewhere
+        available_years_set = df.attrs.get('years_set') or set(df[year_column].unique())
+        missing_years = set(years) - available_years_set
+        if missing_years:
+            logger.debug(
+                f"filter_by_years: {len(missing_years)} requested years not found in data: "
+                f"{sorted(missing_years)}"
+            )
+
+    # Single-year requests on a chronologically sorted frame have all
+    # matching rows contiguous, so binary-search the bounds and return a
+    # zero-copy slice instead of building a boolean mask
+    if len(years_arr) == 1:
+        year_sorted = df.attrs.get('year_sorted')
+        if year_sorted is None:
+            year_sorted = (
+                bool(df.attrs.get('date_sorted'))
+                or bool(df[year_column].is_monotonic_increasing)
+            )
+            df.attrs['year_sorted'] = year_sorted
+        if year_sorted:
+            col = df[year_column].to_numpy()
+            lo = np.searchsorted(col, years_arr[0], side='left')
+            hi = np.searchsorted(col, years_arr[0], side='right')
+            filtered_df = df.iloc[lo:hi]
+            logger.debug(
+                "filter_by_years: Sliced %d -> %d rows (single sorted year)",
+                len(df), len(filtered_df)
+            )
+            return filtered_df
+
+    # Perform filtering with a vectorized membership test on the raw array
+    mask = np.isin(df[year_column].to_numpy(), years_arr)
+    filtered_df = df[mask]
+
+    logger.debug(
+        "filter_by_years: Filtered %d -> %d rows (%d years requested)",
+        len(df), len(filtered_df), len(years)
     )
 
     return filtered_df
@@ -176,45 +215,66 @@ def filter_by_products(
 
     # Handle None (no filtering)
     if product_ids is None:
-        logger.info("filter_by_products: No product filter applied (product_ids=None)")
-        return df.copy()
+        logger.debug("filter_by_products: No product filter applied (product_ids=None)")
+        return df
 
     # Handle empty list
     if not product_ids:
-        logger.info("filter_by_products: Empty product list, returning empty DataFrame")
-        return df.iloc[0:0].copy()
+        logger.debug("filter_by_products: Empty product list, returning empty DataFrame")
+        return df.iloc[0:0]
 
-    # Validate product ID values
-    if not all(isinstance(pid, int) for pid in product_ids):
+    # Validate product ID values with the same typed-array cast as
+    # filter_by_years, reusing the array for the membership test
+    product_arr = np.asarray(product_ids)
+    if product_arr.dtype.kind not in 'iu':
         error_msg = "All product IDs must be integers"
         logger.error(f"filter_by_products: {error_msg}")
         raise ValueError(error_msg)
-
-    # Get available products
-    available_products = df[product_column].unique()
-    requested_products_set = set(product_ids)
-    available_products_set = set(available_products)
-    matching_products = requested_products_set & available_products_set
-    missing_products = requested_products_set - available_products_set
-
-    if missing_products:
-        logger.warning(
-            f"filter_by_products: {len(missing_products)} requested products not found: "
-            f"{sorted(missing_products)}"
-        )
-
-    if not matching_products:
-        logger.warning(
-            f"filter_by_products: None of the requested products exist in the dataset"
+    product_arr = product_arr.astype(np.int64, copy=False)
+
+    # Short-circuit when the request covers every product present
+    cached_products = df.attrs.get('products_set')
+    if cached_products and set(product_ids) >= cached_products:
+        logger.debug("filter_by_products: Requested products cover all data, no filtering needed")
+        return df
+
+    # Debug-only diagnostics, mirroring filter_by_years
+    if logger.isEnabledFor(logging.DEBUG):
+        available_products_set = (
+            df.attrs.get('products_set') or set(df[product_column].unique())
         )
-        return df.iloc[0:0].copy()
-
-    # Perform filtering
-    filtered_df = df[df[product_column].isin(product_ids)].copy()
-
-    logger.info(
-        f"filter_by_products: Filtered {len(df):,} -> {len(filtered_df):,} rows "
-        f"({len(matching_products)} products)"
+        missing_products = set(product_ids) - available_products_set
+        if missing_products:
+            logger.debug(
+                f"filter_by_products: {len(missing_products)} requested products not found: "
+                f"{sorted(missing_products)}"
+            )
+
+    # Same contiguous-slice fast path as filter_by_years for frames
+    # sorted by product (rare for this dataset, but free to check once)
+    if len(product_arr) == 1:
+        product_sorted = df.attrs.get('product_sorted')
+        if product_sorted is None:
+            product_sorted = bool(df[product_column].is_monotonic_increasing)
+            df.attrs['product_sorted'] = product_sorted
+        if product_sorted:
+            col = df[product_column].to_numpy()
+            lo = np.searchsorted(col, product_arr[0], side='left')
+            hi = np.searchsorted(col, product_arr[0], side='right')
+            filtered_df = df.iloc[lo:hi]
+            logger.debug(
+                "filter_by_products: Sliced %d -> %d rows (single sorted product)",
+                len(df), len(filtered_df)
+            )
+            return filtered_df
+
+    # Perform filtering with a vectorized membership test on the raw array
+    mask = np.isin(df[product_column].to_numpy(), product_arr)
+    filtered_df = df[mask]
+
+    logger.debug(
+        "filter_by_products: Filtered %d -> %d rows (%d products requested)",
+        len(df), len(filtered_df), len(product_ids)
     )
 
     return filtered_df
@@ -262,8 +322,8 @@ def filter_by_date_range(
 
     # Handle no filtering
     if start_date is None and end_date is None:
-        logger.info("filter_by_date_range: No date filter applied")
-        return df.copy()
+        logger.debug("filter_by_date_range: No date filter applied")
+        return df
 
     # Validate date range
     if start_date is not None and end_date is not None:
@@ -272,18 +332,38 @@ def filter_by_date_range(
             logger.error(f"filter_by_date_range: {error_msg}")
             raise ValueError(error_msg)
 
-    # Build filter condition
-    filtered_df = df.copy()
-
-    if start_date is not None:
-        filtered_df = filtered_df[filtered_df[date_column] >= start_date]
-
-    if end_date is not None:
-        filtered_df = filtered_df[filtered_df[date_column] <= end_date]
-
-    logger.info(
-        f"filter_by_date_range: Filtered {len(df):,} -> {len(filtered_df):,} rows "
-        f"(from {start_date} to {end_date})"
+    if df.attrs.get('date_sorted'):
+        # Chronologically sorted frames (flagged at load time) let us
+        # binary-search the two slice bounds instead of scanning every row
+        dates = df[date_column].to_numpy()
+        lo = (
+            np.searchsorted(dates, np.datetime64(start_date), side='left')
+            if start_date is not None else 0
+        )
+        hi = (
+            np.searchsorted(dates, np.datetime64(end_date), side='right')
+            if end_date is not None else len(df)
+        )
+        filtered_df = df.iloc[lo:hi]
+    else:
+        # Fuse both bounds into one predicate over the raw datetime64
+        # array and slice once, instead of materializing an intermediate
+        # frame per bound
+        dates = df[date_column].to_numpy()
+
+        if start_date is not None and end_date is not None:
+            mask = (dates >= np.datetime64(start_date))
+            mask &= (dates <= np.datetime64(end_date))
+        elif start_date is not None:
+            mask = dates >= np.datetime64(start_date)
+        else:
+            mask = dates <= np.datetime64(end_date)
+
+        filtered_df = df[mask]
+
+    logger.debug(
+        "filter_by_date_range: Filtered %d -> %d rows (from %s to %s)",
+        len(df), len(filtered_df), start_date, end_date
     )
 
     return filtered_df
@@ -297,10 +377,11 @@ def apply_combined_filters(
     end_date: Optional[pd.Timestamp] = None
 ) -> pd.DataFrame:
     """
-    Apply multiple filters in sequence.
+    Apply multiple filters in one pass.
 
-    Convenience function that applies year, product, and date filters
-    in a single call. Filters are applied in order: years -> products -> dates.
+    Convenience function that combines year, product, and date predicates
+    into a single boolean mask and slices the frame once, instead of
+    materializing an intermediate DataFrame per filter.
 
     Args:
         df (pd.DataFrame): Input DataFrame to filter
@@ -323,22 +404,143 @@ def apply_combined_filters(
         >>> # Apply only year filter
         >>> filtered = apply_combined_filters(df, years=range(2020, 2023))
     """
-    result = df.copy()
-
-    # Apply year filter
-    if years is not None:
-        result = filter_by_years(result, years)
-
-    # Apply product filter
-    if product_ids is not None:
-        result = filter_by_products(result, product_ids)
+    # Validate inputs
+    if df is None or df.empty:
+        logger.warning("apply_combined_filters: Input DataFrame is empty or None")
+        return df if df is not None else pd.DataFrame()
 
-    # Apply date range filter
-    if start_date is not None or end_date is not None:
-        result = filter_by_date_range(result, start_date, end_date)
+    # Normalize parameters into a hashable cache key; the finalizer
+    # registered on insertion invalidates it when this frame dies.
+    if isinstance(years, range):
+        years = list(years)
+    cache_key = (
+        id(df),
+        len(df),
+        tuple(sorted(years)) if years is not None else None,
+        tuple(sorted(product_ids)) if product_ids is not None else None,
+        start_date,
+        end_date
+    )
 
-    logger.info(
-        f"apply_combined_filters: Total filtering {len(df):,} -> {len(result):,} rows"
+    mask = _mask_cache.get(cache_key)
+    if mask is None:
+        mask = build_combined_mask(df, years, product_ids, start_date, end_date)
+        _mask_cache[cache_key] = mask
+        weakref.finalize(df, _mask_cache.pop, cache_key, None)
+        if len(_mask_cache) > _MASK_CACHE_MAXSIZE:
+            _mask_cache.popitem(last=False)
+    else:
+        _mask_cache.move_to_end(cache_key)
+        logger.debug("apply_combined_filters: mask cache hit")
+
+    result = df[mask]
+
+    logger.debug(
+        "apply_combined_filters: Total filtering %d -> %d rows",
+        len(df), len(result)
     )
 
     return result
+
+
+def build_combined_mask(
+    df: pd.DataFrame,
+    years: Union[List[int], range, None] = None,
+    product_ids: Union[List[int], None] = None,
+    start_date: Optional[pd.Timestamp] = None,
+    end_date: Optional[pd.Timestamp] = None
+) -> np.ndarray:
+    """
+    Build the combined year/product/date boolean mask without slicing.
+
+    This is the predicate half of apply_combined_filters, exposed so that
+    hot paths (e.g. fused KPI computation) can apply the mask to
+    individual columns instead of materializing a filtered frame.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame (must be non-empty)
+        years (Union[List[int], range, None]): Years to include
+        product_ids (Union[List[int], None]): Product IDs to include
+        start_date (Optional[pd.Timestamp]): Start date (inclusive)
+        end_date (Optional[pd.Timestamp]): End date (inclusive)
+
+    Returns:
+        np.ndarray: Boolean mask aligned with df's rows
+
+    Raises:
+        FilterError: If a referenced column doesn't exist in DataFrame
+        ValueError: If invalid values are provided or start_date > end_date
+    """
+    # Validate date range up front, matching filter_by_date_range
+    if start_date is not None and end_date is not None:
+        if start_date > end_date:
+            error_msg = f"start_date ({start_date}) cannot be after end_date ({end_date})"
+            logger.error(f"build_combined_mask: {error_msg}")
+            raise ValueError(error_msg)
+
+    mask = np.ones(len(df), dtype=bool)
+
+    # Year predicate
+    if years is not None:
+        if 'invoice_year' not in df.columns:
+            error_msg = (
+                f"Column 'invoice_year' not found in DataFrame. "
+                f"Available columns: {', '.join(df.columns)}"
+            )
+            logger.error(error_msg)
+            raise FilterError(error_msg)
+        if isinstance(years, range):
+            years = list(years)
+        if years:
+            # Same typed-array validation as filter_by_years: one dtype
+            # check instead of per-element isinstance, reused by np.isin
+            years_arr = np.asarray(years)
+            if years_arr.dtype.kind not in 'iu':
+                error_msg = "All year values must be integers"
+                logger.error(f"build_combined_mask: {error_msg}")
+                raise ValueError(error_msg)
+            mask &= np.isin(
+                df['invoice_year'].to_numpy(),
+                years_arr.astype(np.int64, copy=False)
+            )
+        else:
+            mask[:] = False
+
+    # Product predicate
+    if product_ids is not None:
+        if 'product_id' not in df.columns:
+            error_msg = (
+                f"Column 'product_id' not found in DataFrame. "
+                f"Available columns: {', '.join(df.columns)}"
+            )
+            logger.error(error_msg)
+            raise FilterError(error_msg)
+        if product_ids:
+            product_arr = np.asarray(product_ids)
+            if product_arr.dtype.kind not in 'iu':
+                error_msg = "All product IDs must be integers"
+                logger.error(f"build_combined_mask: {error_msg}")
+                raise ValueError(error_msg)
+            mask &= np.isin(
+                df['product_id'].to_numpy(),
+                product_arr.astype(np.int64, copy=False)
+            )
+        else:
+            mask[:] = False
+
+    # Date-range predicate
+    if start_date is not None or end_date is not None:
+        if 'invoice_date' not in df.columns:
+            error_msg = (
+                f"Column 'invoice_date' not found in DataFrame. "
+                f"Available columns: {', '.join(df.columns)}"
+            )
+            logger.error(error_msg)
+            raise FilterError(error_msg)
+        dates = df['invoice_date'].to_numpy()
+        if start_date is not None:
+            mask &= (dates >= np.datetime64(start_date))
+        if end_date is not None:
+            mask &= (dates <= np.datetime64(end_date))
+
+    return mask
@@ -13,17 +13,193 @@ KPIs:
 """
 
 import pandas as pd
+import numpy as np
+import functools
 import logging
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
 from typing import Optional
 
+from .filters import build_combined_mask
+
 logger = logging.getLogger(__name__)
 
+# Optional Numba kernel for the all-KPIs reduction: one parallel pass
+# produces both the quantity sum and the revenue dot product. Numba is
+# not a hard dependency, so fall back to numpy when it is unavailable
+# (same optional-import pattern as the pyarrow join in the transformer).
+try:
+    from numba import njit, prange
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _fused_qty_revenue_reduce(qty, amt):
+        s_q = 0.0
+        s_r = 0.0
+        for i in prange(qty.shape[0]):
+            s_q += qty[i]
+            s_r += qty[i] * amt[i]
+        return s_q, s_r
+
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+# Small LRU cache of per-year KPI tables, keyed on the frame's identity
+# and the source column names, with weakref-finalize eviction on frame
+# collection. One groupby builds every year's KPIs at once; subsequent
+# per-year and YoY lookups on the same frame are O(1) dict reads.
+_yearly_kpi_cache: 'OrderedDict[tuple, KPITable]' = OrderedDict()
+_YEARLY_KPI_CACHE_MAXSIZE = 8
+
+# Memoized calculate_all_kpis results. Dashboard reruns hand the same
+# filtered frame back repeatedly when unrelated UI state toggles, so the
+# whole KPI dict is cached on the frame's identity. A weakref.finalize
+# per entry evicts it when the frame is garbage collected, so a recycled
+# id can never serve another frame's KPIs; the LRU bound is a backstop.
+_all_kpi_cache: 'OrderedDict[tuple, dict]' = OrderedDict()
+_ALL_KPI_CACHE_MAXSIZE = 32
+
+# Cached sorted-year lists keyed on frame identity, with weakref-finalize
+# eviction on frame collection: the year dropdown asks for this on every
+# dashboard render while the data never changes.
+_years_cache: 'OrderedDict[tuple, list]' = OrderedDict()
+_YEARS_CACHE_MAXSIZE = 8
+
 
 class KPIError(Exception):
     """Custom exception for KPI computation errors."""
     pass
 
 
+@dataclass(frozen=True, slots=True)
+class KPIResult:
+    """
+    Immutable KPI bundle with slot-based attribute access.
+
+    Downstream code reads metrics as attributes (kpis.total_revenue)
+    without per-access string hashing; ``__getitem__``/``get`` keep the
+    historical dict-style access working for existing callers.
+    """
+    total_revenue: float
+    total_quantity: int
+    avg_transaction_value: float
+    num_transactions: int
+    unique_customers: int = 0
+    unique_products: int = 0
+    year: Optional[int] = None
+
+    def __getitem__(self, key: str):
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def to_dict(self) -> dict:
+        """Return the metrics as a plain dict (e.g. for JSON)."""
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class KPITable:
+    """
+    Column-oriented per-year KPI storage.
+
+    One contiguous numpy array per metric, all indexed by position in the
+    sorted ``years`` array, instead of a heap-allocated dict of boxed
+    scalars per year. Lookups binary-search ``years`` and assemble the
+    per-year dict only for the requested row.
+    """
+    years: np.ndarray
+    total_revenue: np.ndarray
+    total_quantity: np.ndarray
+    avg_transaction_value: np.ndarray
+    num_transactions: np.ndarray
+    unique_customers: np.ndarray
+    unique_products: np.ndarray
+
+    def get(self, year: int) -> 'Optional[KPIResult]':
+        """Return the KPIResult for ``year``, or None if absent."""
+        idx = int(np.searchsorted(self.years, year))
+        if idx >= self.years.size or self.years[idx] != year:
+            return None
+        return KPIResult(
+            year=int(self.years[idx]),
+            total_revenue=float(self.total_revenue[idx]),
+            total_quantity=int(self.total_quantity[idx]),
+            avg_transaction_value=float(self.avg_transaction_value[idx]),
+            num_transactions=int(self.num_transactions[idx]),
+            unique_customers=int(self.unique_customers[idx]),
+            unique_products=int(self.unique_products[idx])
+        )
+
+
+def empty_returns(empty_value):
+    """
+    Short-circuit a KPI function when its DataFrame is None or empty.
+
+    Replaces the guard boilerplate each KPI function opened with; the
+    wrapped body only runs for non-empty input. Mutable sentinel values
+    (dict/list) are copied per call so callers can't share state.
+
+    Args:
+        empty_value: Value to return for None/empty input
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(df, *args, **kwargs):
+            if df is None or len(df) == 0:
+                logger.debug(
+                    "%s: Empty DataFrame, returning %r", fn.__name__, empty_value
+                )
+                if isinstance(empty_value, (dict, list)):
+                    return type(empty_value)(empty_value)
+                return empty_value
+            return fn(df, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def ensure_total_amount(
+    df: pd.DataFrame,
+    qty_column: str = 'qty',
+    amount_column: str = 'amount',
+    total_amount_column: str = 'total_amount'
+) -> pd.DataFrame:
+    """
+    Materialize the line-total column in place, once.
+
+    Callers that build frames outside the loader (which precomputes
+    total_amount during ingestion) can invoke this before handing data to
+    the KPI functions so every downstream revenue computation hits the
+    single-column fast path instead of multiplying qty*amount per call.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame, modified in place
+        qty_column (str): Name of quantity column. Defaults to 'qty'
+        amount_column (str): Name of unit amount column. Defaults to 'amount'
+        total_amount_column (str): Name of total amount column. Defaults to 'total_amount'
+
+    Returns:
+        pd.DataFrame: The same DataFrame, for chaining
+    """
+    if (
+        df is not None
+        and total_amount_column not in df.columns
+        and qty_column in df.columns
+        and amount_column in df.columns
+    ):
+        df[total_amount_column] = (
+            df[qty_column].to_numpy() * df[amount_column].to_numpy()
+        )
+        logger.debug(
+            "ensure_total_amount: materialized '%s' from %s * %s",
+            total_amount_column, qty_column, amount_column
+        )
+    return df
+
+
+@empty_returns(0.0)
 def calculate_total_revenue(
     df: pd.DataFrame,
     qty_column: str = 'qty',
@@ -53,28 +229,17 @@ def calculate_total_revenue(
         >>> total = calculate_total_revenue(df)
         >>> print(f"Total Revenue: ${total:,.2f}")
     """
-    # Handle None or empty DataFrame
-    if df is None or df.empty:
-        logger.info("calculate_total_revenue: Empty DataFrame, returning 0.0")
-        return 0.0
+    # Materialize line totals on first miss so repeated revenue calls on
+    # the same frame pay the qty*amount multiply only once
+    ensure_total_amount(df, qty_column, amount_column, total_amount_column)
 
-    # Try to use pre-computed total_amount column
     if total_amount_column in df.columns:
         try:
             revenue = df[total_amount_column].sum()
-            logger.debug(f"calculate_total_revenue: ${revenue:,.2f} from {len(df):,} rows")
+            logger.debug("calculate_total_revenue: $%.2f from %d rows", revenue, len(df))
             return float(revenue)
         except Exception as e:
-            logger.warning(f"Error using {total_amount_column} column: {e}")
-
-    # Fall back to calculating from qty * amount
-    if qty_column in df.columns and amount_column in df.columns:
-        try:
-            revenue = (df[qty_column] * df[amount_column]).sum()
-            logger.debug(f"calculate_total_revenue: ${revenue:,.2f} (calculated from qty*amount)")
-            return float(revenue)
-        except Exception as e:
-            error_msg = f"Error calculating revenue from {qty_column} * {amount_column}: {e}"
+            error_msg = f"Error summing {total_amount_column} column: {e}"
             logger.error(error_msg)
             raise KPIError(error_msg)
 
@@ -88,6 +253,7 @@ def calculate_total_revenue(
     raise KPIError(error_msg)
 
 
+@empty_returns(0)
 def calculate_total_quantity(
     df: pd.DataFrame,
     qty_column: str = 'qty'
@@ -109,11 +275,6 @@ def calculate_total_quantity(
         >>> qty = calculate_total_quantity(df)
         >>> print(f"Total Quantity: {qty:,} units")
     """
-    # Handle None or empty DataFrame
-    if df is None or df.empty:
-        logger.info("calculate_total_quantity: Empty DataFrame, returning 0")
-        return 0
-
     # Check if column exists
     if qty_column not in df.columns:
         error_msg = (
@@ -124,15 +285,22 @@ def calculate_total_quantity(
         raise KPIError(error_msg)
 
     try:
-        total_qty = df[qty_column].sum()
-        logger.debug(f"calculate_total_quantity: {total_qty:,} units from {len(df):,} rows")
-        return int(total_qty)
+        qty = df[qty_column]
+        if qty.dtype.kind in 'iu':
+            # Integer columns cannot hold NaN, so reduce the raw array
+            # directly and skip pandas' nan-handling dispatch
+            total_qty = int(np.add.reduce(qty.to_numpy()))
+        else:
+            total_qty = int(qty.sum())
+        logger.debug("calculate_total_quantity: %s units from %d rows", total_qty, len(df))
+        return total_qty
     except Exception as e:
         error_msg = f"Error calculating total quantity: {e}"
         logger.error(error_msg)
         raise KPIError(error_msg)
 
 
+@empty_returns(0.0)
 def calculate_average_transaction_value(
     df: pd.DataFrame,
     qty_column: str = 'qty',
@@ -160,11 +328,6 @@ def calculate_average_transaction_value(
         >>> avg = calculate_average_transaction_value(df)
         >>> print(f"Avg Transaction: ${avg:,.2f}")
     """
-    # Handle None or empty DataFrame
-    if df is None or df.empty:
-        logger.info("calculate_average_transaction_value: Empty DataFrame, returning 0.0")
-        return 0.0
-
     try:
         # Calculate total revenue
         total_revenue = calculate_total_revenue(
@@ -182,8 +345,8 @@ def calculate_average_transaction_value(
 
         avg_value = total_revenue / num_transactions
         logger.debug(
-            f"calculate_average_transaction_value: ${avg_value:,.2f} "
-            f"({total_revenue:,.2f} / {num_transactions:,})"
+            "calculate_average_transaction_value: $%.2f (%.2f / %d)",
+            avg_value, total_revenue, num_transactions
         )
         return float(avg_value)
 
@@ -195,6 +358,7 @@ def calculate_average_transaction_value(
         raise KPIError(error_msg)
 
 
+@empty_returns(0)
 def calculate_num_transactions(df: pd.DataFrame) -> int:
     """
     Calculate the number of transactions (row count).
@@ -209,24 +373,20 @@ def calculate_num_transactions(df: pd.DataFrame) -> int:
         >>> count = calculate_num_transactions(df)
         >>> print(f"Transactions: {count:,}")
     """
-    # Handle None or empty DataFrame
-    if df is None or df.empty:
-        logger.info("calculate_num_transactions: Empty DataFrame, returning 0")
-        return 0
-
     count = len(df)
-    logger.debug(f"calculate_num_transactions: {count:,} transactions")
+    logger.debug("calculate_num_transactions: %d transactions", count)
     return count
 
 
+@empty_returns(KPIResult(0.0, 0, 0.0, 0))
 def calculate_all_kpis(
     df: pd.DataFrame,
     qty_column: str = 'qty',
     amount_column: str = 'amount',
     total_amount_column: str = 'total_amount'
-) -> dict:
+) -> KPIResult:
     """
-    Calculate all KPIs at once and return as a dictionary.
+    Calculate all KPIs at once and return them as a KPIResult.
 
     This is a convenience function that computes all KPIs in a single call.
     More efficient than calling individual functions separately when you need
@@ -239,11 +399,13 @@ def calculate_all_kpis(
         total_amount_column (str): Name of total amount column. Defaults to 'total_amount'
 
     Returns:
-        dict: Dictionary containing all KPIs:
+        KPIResult: Frozen KPI bundle with fields:
             - total_revenue (float)
             - total_quantity (int)
             - avg_transaction_value (float)
             - num_transactions (int)
+            Supports attribute access plus dict-style __getitem__/get and
+            to_dict(); it does not support ``in``, iteration or .items().
 
     Raises:
         KPIError: If required columns are missing from DataFrame
@@ -255,50 +417,98 @@ def calculate_all_kpis(
         >>> print(f"Avg Value: ${kpis['avg_transaction_value']:,.2f}")
         >>> print(f"Transactions: {kpis['num_transactions']:,}")
     """
-    # Handle None or empty DataFrame
-    if df is None or df.empty:
-        logger.info("calculate_all_kpis: Empty DataFrame, returning zeros")
-        return {
-            'total_revenue': 0.0,
-            'total_quantity': 0,
-            'avg_transaction_value': 0.0,
-            'num_transactions': 0
-        }
+    cache_key = (
+        id(df), df.shape, qty_column, amount_column, total_amount_column
+    )
+    cached = _all_kpi_cache.get(cache_key)
+    if cached is not None:
+        _all_kpi_cache.move_to_end(cache_key)
+        return cached
 
     try:
-        # Calculate all KPIs
-        total_revenue = calculate_total_revenue(
-            df,
-            qty_column=qty_column,
-            amount_column=amount_column,
-            total_amount_column=total_amount_column
-        )
+        # Compute all KPIs in a single pass over the underlying arrays
+        # instead of delegating to the standalone functions, which would
+        # re-scan the qty/amount columns for each metric
+        if qty_column not in df.columns:
+            error_msg = (
+                f"Column '{qty_column}' not found in DataFrame. "
+                f"Available columns: {', '.join(df.columns)}"
+            )
+            logger.error(error_msg)
+            raise KPIError(error_msg)
 
-        total_quantity = calculate_total_quantity(df, qty_column=qty_column)
+        if logger.isEnabledFor(logging.DEBUG):
+            _check_columnar_layout(df)
+
+        # ascontiguousarray is a no-op for the usual one-block-per-column
+        # layout and copies a strided column view to a dense buffer once,
+        # so the reductions below always stream over contiguous memory
+        qty = np.ascontiguousarray(df[qty_column].to_numpy())
+
+        total_quantity = None
+        if total_amount_column in df.columns:
+            # Read the column at its stored width (float32 after loader
+            # downcasting: half the DRAM traffic) but accumulate the
+            # running total in float64 so precision never degrades
+            total_revenue = float(np.add.reduce(
+                df[total_amount_column].to_numpy(), dtype=np.float64
+            ))
+        elif amount_column in df.columns:
+            amt_f = np.ascontiguousarray(df[amount_column].to_numpy())
+            if amt_f.dtype == np.float32:
+                # Keep both operands float32: BLAS sdot moves half the
+                # bytes and doubles the SIMD lane count
+                qty_f = qty.astype(np.float32, copy=False)
+            else:
+                qty_f = qty.astype(np.float64, copy=False)
+                amt_f = amt_f.astype(np.float64, copy=False)
+            if _HAS_NUMBA:
+                # One parallel pass yields both reductions
+                s_q, s_r = _fused_qty_revenue_reduce(qty_f, amt_f)
+                total_revenue = float(s_r)
+                total_quantity = int(s_q)
+            else:
+                # np.dot fuses the multiply and reduction in one streaming
+                # pass with no N-element temporary
+                total_revenue = float(np.dot(qty_f, amt_f))
+        else:
+            error_msg = (
+                f"Cannot calculate revenue: DataFrame must contain either "
+                f"'{total_amount_column}' or both '{qty_column}' and "
+                f"'{amount_column}'. "
+                f"Available columns: {', '.join(df.columns)}"
+            )
+            logger.error(error_msg)
+            raise KPIError(error_msg)
 
-        avg_transaction_value = calculate_average_transaction_value(
-            df,
-            qty_column=qty_column,
-            amount_column=amount_column,
-            total_amount_column=total_amount_column
+        if total_quantity is None:
+            total_quantity = int(qty.sum())
+        num_transactions = len(df)
+        avg_transaction_value = (
+            total_revenue / num_transactions if num_transactions else 0.0
         )
 
-        num_transactions = calculate_num_transactions(df)
-
-        kpis = {
-            'total_revenue': total_revenue,
-            'total_quantity': total_quantity,
-            'avg_transaction_value': avg_transaction_value,
-            'num_transactions': num_transactions
-        }
+        kpis = KPIResult(
+            total_revenue=total_revenue,
+            total_quantity=total_quantity,
+            avg_transaction_value=avg_transaction_value,
+            num_transactions=num_transactions
+        )
 
-        logger.info(
-            f"calculate_all_kpis: Revenue=${kpis['total_revenue']:,.2f}, "
-            f"Qty={kpis['total_quantity']:,}, "
-            f"Avg=${kpis['avg_transaction_value']:,.2f}, "
-            f"Count={kpis['num_transactions']:,}"
+        logger.debug(
+            "calculate_all_kpis: Revenue=$%.2f, Qty=%d, Avg=$%.2f, Count=%d",
+            kpis['total_revenue'], kpis['total_quantity'],
+            kpis['avg_transaction_value'], kpis['num_transactions']
         )
 
+        # KPIResult is frozen, so the cached instance can be shared safely.
+        # Evict when the frame dies: otherwise a new frame allocated at the
+        # recycled id (with the same shape) would hit this stale entry.
+        _all_kpi_cache[cache_key] = kpis
+        weakref.finalize(df, _all_kpi_cache.pop, cache_key, None)
+        if len(_all_kpi_cache) > _ALL_KPI_CACHE_MAXSIZE:
+            _all_kpi_cache.popitem(last=False)
+
         return kpis
 
     except KPIError:
@@ -309,9 +519,98 @@ def calculate_all_kpis(
         raise KPIError(error_msg)
 
 
+@empty_returns(KPIResult(0.0, 0, 0.0, 0))
+def calculate_filtered_kpis(
+    df: pd.DataFrame,
+    years=None,
+    product_ids=None,
+    start_date=None,
+    end_date=None,
+    qty_column: str = 'qty',
+    amount_column: str = 'amount',
+    total_amount_column: str = 'total_amount'
+) -> KPIResult:
+    """
+    Apply year/product/date filters and compute all KPIs in one fused pass.
+
+    This is the dashboard hot path: instead of materializing a filtered
+    DataFrame and then scanning it per KPI, the combined filter mask is
+    applied directly to the qty/amount arrays and all KPIs come out of
+    that single compressed read.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame
+        years: Years to include (see filters.build_combined_mask)
+        product_ids: Product IDs to include
+        start_date: Start date (inclusive)
+        end_date: End date (inclusive)
+        qty_column (str): Name of quantity column. Defaults to 'qty'
+        amount_column (str): Name of unit amount column. Defaults to 'amount'
+        total_amount_column (str): Name of total amount column. Defaults to 'total_amount'
+
+    Returns:
+        KPIResult: Same frozen KPI bundle as calculate_all_kpis (attribute
+            access plus dict-style __getitem__/get/to_dict)
+
+    Raises:
+        KPIError: If required columns are missing from DataFrame
+
+    Examples:
+        >>> kpis = calculate_filtered_kpis(df, years=[2021, 2022])
+        >>> print(f"Revenue: ${kpis['total_revenue']:,.2f}")
+    """
+    mask = build_combined_mask(df, years, product_ids, start_date, end_date)
+
+    if qty_column not in df.columns:
+        error_msg = (
+            f"Column '{qty_column}' not found in DataFrame. "
+            f"Available columns: {', '.join(df.columns)}"
+        )
+        logger.error(error_msg)
+        raise KPIError(error_msg)
+
+    qty = df[qty_column].to_numpy()[mask]
+
+    if total_amount_column in df.columns:
+        total_revenue = float(df[total_amount_column].to_numpy()[mask].sum())
+    elif amount_column in df.columns:
+        total_revenue = float(np.dot(
+            qty.astype(np.float64),
+            df[amount_column].to_numpy(dtype=np.float64)[mask]
+        ))
+    else:
+        error_msg = (
+            f"Cannot calculate revenue: DataFrame must contain either "
+            f"'{total_amount_column}' or both '{qty_column}' and "
+            f"'{amount_column}'. "
+            f"Available columns: {', '.join(df.columns)}"
+        )
+        logger.error(error_msg)
+        raise KPIError(error_msg)
+
+    num_transactions = int(mask.sum())
+    kpis = KPIResult(
+        total_revenue=total_revenue,
+        total_quantity=int(qty.sum()),
+        avg_transaction_value=(
+            total_revenue / num_transactions if num_transactions else 0.0
+        ),
+        num_transactions=num_transactions
+    )
+
+    logger.debug(
+        "calculate_filtered_kpis: %d of %d rows, Revenue=$%.2f",
+        num_transactions, len(df), kpis['total_revenue']
+    )
+
+    return kpis
+
+
+@empty_returns(0)
 def calculate_unique_customers(
     df: pd.DataFrame,
-    email_column: str = 'email'
+    email_column: str = 'email',
+    approximate: bool = False
 ) -> int:
     """
     Calculate the number of unique customers.
@@ -321,6 +620,9 @@ def calculate_unique_customers(
     Args:
         df (pd.DataFrame): Input DataFrame (can be filtered)
         email_column (str): Name of email column. Defaults to 'email'
+        approximate (bool): Estimate the count with a HyperLogLog sketch
+            (~1% error, constant memory) instead of an exact hash of
+            every value. Defaults to False
 
     Returns:
         int: Number of unique customers. Returns 0 for empty DataFrame.
@@ -332,11 +634,6 @@ def calculate_unique_customers(
         >>> customers = calculate_unique_customers(df)
         >>> print(f"Unique Customers: {customers:,}")
     """
-    # Handle None or empty DataFrame
-    if df is None or df.empty:
-        logger.info("calculate_unique_customers: Empty DataFrame, returning 0")
-        return 0
-
     # Check if column exists
     if email_column not in df.columns:
         error_msg = (
@@ -347,8 +644,21 @@ def calculate_unique_customers(
         raise KPIError(error_msg)
 
     try:
-        unique_count = df[email_column].nunique()
-        logger.debug(f"calculate_unique_customers: {unique_count:,} unique customers")
+        emails = df[email_column]
+        if approximate:
+            unique_count = _approx_nunique(_integer_codes(emails))
+        elif isinstance(emails.dtype, pd.CategoricalDtype):
+            # Categorical columns (cast once by the transformer) count
+            # distinct int codes instead of hashing every string
+            codes = np.unique(emails.cat.codes.to_numpy())
+            # Code -1 marks missing values; exclude it like nunique does
+            unique_count = codes.size - (1 if codes.size and codes[0] == -1 else 0)
+        else:
+            # factorize skips nunique's NaN bookkeeping and Python-set
+            # overhead; like nunique, missing values are excluded
+            _, uniques = pd.factorize(emails.to_numpy(), sort=False)
+            unique_count = uniques.size
+        logger.debug("calculate_unique_customers: %d unique customers", unique_count)
         return int(unique_count)
     except Exception as e:
         error_msg = f"Error calculating unique customers: {e}"
@@ -356,9 +666,11 @@ def calculate_unique_customers(
         raise KPIError(error_msg)
 
 
+@empty_returns(0)
 def calculate_unique_products(
     df: pd.DataFrame,
-    product_column: str = 'product_id'
+    product_column: str = 'product_id',
+    approximate: bool = False
 ) -> int:
     """
     Calculate the number of unique products.
@@ -368,6 +680,8 @@ def calculate_unique_products(
     Args:
         df (pd.DataFrame): Input DataFrame (can be filtered)
         product_column (str): Name of product column. Defaults to 'product_id'
+        approximate (bool): Estimate the count with a HyperLogLog sketch
+            instead of an exact scan. Defaults to False
 
     Returns:
         int: Number of unique products. Returns 0 for empty DataFrame.
@@ -379,11 +693,6 @@ def calculate_unique_products(
         >>> products = calculate_unique_products(df)
         >>> print(f"Unique Products: {products:,}")
     """
-    # Handle None or empty DataFrame
-    if df is None or df.empty:
-        logger.info("calculate_unique_products: Empty DataFrame, returning 0")
-        return 0
-
     # Check if column exists
     if product_column not in df.columns:
         error_msg = (
@@ -394,8 +703,21 @@ def calculate_unique_products(
         raise KPIError(error_msg)
 
     try:
-        unique_count = df[product_column].nunique()
-        logger.debug(f"calculate_unique_products: {unique_count:,} unique products")
+        products = df[product_column]
+        if approximate:
+            unique_count = _approx_nunique(_integer_codes(products))
+        elif isinstance(products.dtype, pd.CategoricalDtype):
+            codes = np.unique(products.cat.codes.to_numpy())
+            unique_count = codes.size - (1 if codes.size and codes[0] == -1 else 0)
+        else:
+            arr = products.to_numpy()
+            if arr.dtype.kind in 'iu':
+                # Integer ids sort-dedupe in C; no hash table, no NaN
+                # bookkeeping needed
+                unique_count = np.unique(arr).size
+            else:
+                unique_count = products.nunique()
+        logger.debug("calculate_unique_products: %d unique products", unique_count)
         return int(unique_count)
     except Exception as e:
         error_msg = f"Error calculating unique products: {e}"
@@ -403,6 +725,199 @@ def calculate_unique_products(
         raise KPIError(error_msg)
 
 
+def _approx_nunique(codes: np.ndarray, p: int = 14) -> int:
+    """
+    Estimate the number of distinct values with a HyperLogLog sketch.
+
+    The sketch runs entirely in vectorized numpy: integer codes are mixed
+    through a splitmix64 finalizer, the top ``p`` hash bits pick one of
+    2**p registers, and each register keeps the longest run of leading
+    zeros seen in the remaining bits. Memory is 2**p bytes regardless of
+    input size and the error is roughly 1.04 / sqrt(2**p) (~0.8% at the
+    default p=14).
+
+    Args:
+        codes (np.ndarray): Integer codes (e.g. categorical codes)
+        p (int): Register-count exponent. Defaults to 14
+
+    Returns:
+        int: Estimated distinct count
+    """
+    if codes.size == 0:
+        return 0
+
+    # splitmix64 finalizer, vectorized over the whole column
+    with np.errstate(over='ignore'):
+        x = codes.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        x = x ^ (x >> np.uint64(31))
+
+    m = 1 << p
+    idx = (x >> np.uint64(64 - p)).astype(np.intp)
+    rest = x << np.uint64(p)
+
+    # Leading-zero count via the float64 exponent: bit_length(v) is the
+    # frexp exponent, so clz = 64 - bit_length. Exact enough for a sketch.
+    rank = np.full(x.shape, 64 - p + 1, dtype=np.int64)
+    nonzero = rest != 0
+    _, exponent = np.frexp(rest[nonzero].astype(np.float64))
+    rank[nonzero] = np.minimum(64 - exponent + 1, 64 - p + 1)
+
+    registers = np.zeros(m, dtype=np.int64)
+    np.maximum.at(registers, idx, rank)
+
+    alpha = 0.7213 / (1.0 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.ldexp(1.0, -registers))
+
+    # Small-range correction: linear counting over empty registers
+    zero_registers = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zero_registers:
+        estimate = m * np.log(m / zero_registers)
+
+    return int(round(estimate))
+
+
+def _check_columnar_layout(df: pd.DataFrame) -> None:
+    """
+    Warn (debug-only) when numeric columns live in a row-major block.
+
+    Frames built from a 2D C-order array store several numeric columns in
+    one block whose column views stride through memory, which slows every
+    columnar scan below. The check is gated behind debug logging since it
+    is purely diagnostic.
+    """
+    mgr = getattr(df, '_mgr', None)
+    if mgr is None:
+        return
+    for block in getattr(mgr, 'blocks', ()):
+        values = block.values
+        if (
+            getattr(values, 'ndim', 1) == 2
+            and values.shape[0] > 1
+            and isinstance(values, np.ndarray)
+            and not values.flags.f_contiguous
+        ):
+            logger.debug(
+                "KPI input frame holds %d numeric columns in a row-major "
+                "block; column scans will stride. Consider rebuilding the "
+                "frame column-wise.", values.shape[0]
+            )
+            return
+
+
+def _integer_codes(series: pd.Series) -> np.ndarray:
+    """
+    Get integer codes for a column (categorical codes or factorized).
+
+    Missing values map to -1 in both paths, matching pandas' categorical
+    convention.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy()
+    codes, _ = pd.factorize(series.to_numpy(), sort=False)
+    return codes
+
+
+def _yearly_kpi_table(
+    df: pd.DataFrame,
+    year_column: str,
+    qty_column: str,
+    amount_column: str,
+    total_amount_column: str,
+    email_column: str,
+    product_column: str
+) -> KPITable:
+    """
+    Build (or fetch) the per-year KPI table for a DataFrame.
+
+    A single groupby over the year column yields every per-year KPI at
+    once, so repeated calculate_kpis_for_year calls — and the two calls a
+    YoY comparison makes — become cheap lookups instead of fresh boolean
+    scans. The table is cached keyed on the frame's identity, mirroring
+    the combined-filter mask cache in filters.py.
+
+    Returns:
+        KPITable: Column-oriented per-year KPI arrays sorted by year
+    """
+    key = (
+        id(df), year_column, qty_column, amount_column,
+        total_amount_column, email_column, product_column
+    )
+    table = _yearly_kpi_cache.get(key)
+    if table is not None:
+        _yearly_kpi_cache.move_to_end(key)
+        return table
+
+    if total_amount_column in df.columns:
+        revenue_values = df[total_amount_column].to_numpy(dtype=np.float64)
+    else:
+        revenue_values = (
+            df[qty_column].to_numpy(dtype=np.float64)
+            * df[amount_column].to_numpy(dtype=np.float64)
+        )
+
+    qty_values = df[qty_column].to_numpy(dtype=np.float64)
+    email_codes = _integer_codes(df[email_column])
+    product_codes = _integer_codes(df[product_column])
+    ys = np.asarray(df[year_column].to_numpy(), dtype=np.int64)
+
+    # Years span a small dense range, so bincount over (year - min) bins
+    # sums every year in one cache-friendly pass — no sorting, no groupby
+    offset = int(ys.min())
+    idx = (ys - offset).astype(np.intp)
+    n_bins = int(idx.max()) + 1
+    rev_bins = np.bincount(idx, weights=revenue_values, minlength=n_bins)
+    qty_bins = np.bincount(idx, weights=qty_values, minlength=n_bins)
+    count_bins = np.bincount(idx, minlength=n_bins)
+
+    def _distinct_per_year(codes: np.ndarray) -> np.ndarray:
+        # Dedupe (year, code) pairs via one combined-key np.unique, then
+        # count survivors per year; code -1 (missing) is dropped up front
+        valid = codes >= 0
+        if not valid.all():
+            codes = codes[valid]
+            year_idx = idx[valid]
+        else:
+            year_idx = idx
+        if codes.size == 0:
+            return np.zeros(n_bins, dtype=np.int64)
+        base = np.int64(codes.max()) + 1
+        pairs = year_idx.astype(np.int64) * base + codes
+        uniq = np.unique(pairs)
+        return np.bincount((uniq // base).astype(np.intp), minlength=n_bins)
+
+    cust_bins = _distinct_per_year(email_codes)
+    prod_bins = _distinct_per_year(product_codes)
+
+    observed = np.nonzero(count_bins)[0]
+    uniq_years = offset + observed
+    revenue = rev_bins[observed]
+    quantity = qty_bins[observed].astype(np.int64)
+    counts = count_bins[observed]
+    unique_customers = cust_bins[observed].astype(np.int32)
+    unique_products = prod_bins[observed].astype(np.int32)
+
+    table = KPITable(
+        years=uniq_years,
+        total_revenue=revenue,
+        total_quantity=quantity,
+        avg_transaction_value=np.divide(
+            revenue, counts, out=np.zeros_like(revenue), where=counts > 0
+        ),
+        num_transactions=counts,
+        unique_customers=unique_customers,
+        unique_products=unique_products
+    )
+
+    _yearly_kpi_cache[key] = table
+    weakref.finalize(df, _yearly_kpi_cache.pop, key, None)
+    if len(_yearly_kpi_cache) > _YEARLY_KPI_CACHE_MAXSIZE:
+        _yearly_kpi_cache.popitem(last=False)
+
+    return table
+
+
 def calculate_kpis_for_year(
     df: pd.DataFrame,
     year: int,
@@ -412,7 +927,7 @@ def calculate_kpis_for_year(
     total_amount_column: str = 'total_amount',
     email_column: str = 'email',
     product_column: str = 'product_id'
-) -> dict:
+) -> KPIResult:
     """
     Calculate all KPIs for a specific year.
 
@@ -427,7 +942,7 @@ def calculate_kpis_for_year(
         product_column (str): Name of product column. Defaults to 'product_id'
 
     Returns:
-        dict: Dictionary containing all KPIs for the specified year:
+        KPIResult: Frozen KPI bundle for the specified year with fields:
             - year (int): The year
             - total_revenue (float)
             - total_quantity (int)
@@ -435,6 +950,8 @@ def calculate_kpis_for_year(
             - num_transactions (int)
             - unique_customers (int)
             - unique_products (int)
+            Supports attribute access plus dict-style __getitem__/get and
+            to_dict(); it does not support ``in``, iteration or .items().
 
     Raises:
         KPIError: If year column is missing or other errors occur
@@ -445,16 +962,8 @@ def calculate_kpis_for_year(
     """
     # Handle None or empty DataFrame
     if df is None or df.empty:
-        logger.info(f"calculate_kpis_for_year: Empty DataFrame for year {year}")
-        return {
-            'year': year,
-            'total_revenue': 0.0,
-            'total_quantity': 0,
-            'avg_transaction_value': 0.0,
-            'num_transactions': 0,
-            'unique_customers': 0,
-            'unique_products': 0
-        }
+        logger.debug("calculate_kpis_for_year: Empty DataFrame for year %s", year)
+        return KPIResult(0.0, 0, 0.0, 0, 0, 0, year)
 
     # Check if year column exists
     if year_column not in df.columns:
@@ -466,39 +975,21 @@ def calculate_kpis_for_year(
         raise KPIError(error_msg)
 
     try:
-        # Filter data for the specified year
-        year_df = df[df[year_column] == year].copy()
-
-        if year_df.empty:
-            logger.info(f"calculate_kpis_for_year: No data found for year {year}")
-            return {
-                'year': year,
-                'total_revenue': 0.0,
-                'total_quantity': 0,
-                'avg_transaction_value': 0.0,
-                'num_transactions': 0,
-                'unique_customers': 0,
-                'unique_products': 0
-            }
+        # Look the year up in the cached per-year table: one groupby
+        # amortized across every per-year and YoY request on this frame
+        table = _yearly_kpi_table(
+            df, year_column, qty_column, amount_column,
+            total_amount_column, email_column, product_column
+        )
 
-        # Calculate all KPIs for this year
-        kpis = {
-            'year': year,
-            'total_revenue': calculate_total_revenue(
-                year_df, qty_column, amount_column, total_amount_column
-            ),
-            'total_quantity': calculate_total_quantity(year_df, qty_column),
-            'avg_transaction_value': calculate_average_transaction_value(
-                year_df, qty_column, amount_column, total_amount_column
-            ),
-            'num_transactions': calculate_num_transactions(year_df),
-            'unique_customers': calculate_unique_customers(year_df, email_column),
-            'unique_products': calculate_unique_products(year_df, product_column)
-        }
+        kpis = table.get(year)
+        if kpis is None:
+            logger.debug("calculate_kpis_for_year: No data found for year %s", year)
+            return KPIResult(0.0, 0, 0.0, 0, 0, 0, year)
 
-        logger.info(
-            f"calculate_kpis_for_year {year}: Revenue=${kpis['total_revenue']:,.2f}, "
-            f"Transactions={kpis['num_transactions']:,}"
+        logger.debug(
+            "calculate_kpis_for_year %s: Revenue=$%.2f, Transactions=%d",
+            year, kpis['total_revenue'], kpis['num_transactions']
         )
 
         return kpis
@@ -565,8 +1056,10 @@ def calculate_kpis_with_yoy_comparison(
 
     Returns:
         dict: Dictionary containing:
-            - current (dict): All KPIs for current year
-            - previous (dict): All KPIs for previous year (or None if unavailable)
+            - current (KPIResult): All KPIs for current year
+            - previous (KPIResult): KPIs for previous year (or None if
+              unavailable); both entries support dict-style
+              __getitem__/get/to_dict but not ``in`` or iteration
             - comparison (dict): Percentage changes for each KPI (or None if unavailable)
                 - total_revenue_change (float or None)
                 - total_quantity_change (float or None)
@@ -583,17 +1076,9 @@ def calculate_kpis_with_yoy_comparison(
     """
     # Handle None or empty DataFrame
     if df is None or df.empty:
-        logger.warning(f"calculate_kpis_with_yoy_comparison: Empty DataFrame")
+        logger.warning("calculate_kpis_with_yoy_comparison: Empty DataFrame")
         return {
-            'current': {
-                'year': current_year,
-                'total_revenue': 0.0,
-                'total_quantity': 0,
-                'avg_transaction_value': 0.0,
-                'num_transactions': 0,
-                'unique_customers': 0,
-                'unique_products': 0
-            },
+            'current': KPIResult(0.0, 0, 0.0, 0, 0, 0, current_year),
             'previous': None,
             'comparison': {
                 'total_revenue_change': None,
@@ -605,26 +1090,41 @@ def calculate_kpis_with_yoy_comparison(
             }
         }
 
+    # Check if year column exists
+    if year_column not in df.columns:
+        error_msg = (
+            f"Column '{year_column}' not found in DataFrame. "
+            f"Available columns: {', '.join(df.columns)}"
+        )
+        logger.error(error_msg)
+        raise KPIError(error_msg)
+
     try:
-        # Calculate KPIs for current year
-        current_kpis = calculate_kpis_for_year(
-            df, current_year, year_column, qty_column, amount_column,
+        # Both years come from the cached per-year KPI table: one groupby
+        # over the frame instead of two independent filter+KPI passes
+        table = _yearly_kpi_table(
+            df, year_column, qty_column, amount_column,
             total_amount_column, email_column, product_column
         )
 
-        # Calculate KPIs for previous year
+        current_kpis = (
+            table.get(current_year)
+            or KPIResult(0.0, 0, 0.0, 0, 0, 0, current_year)
+        )
+
         previous_year = current_year - 1
-        previous_kpis = calculate_kpis_for_year(
-            df, previous_year, year_column, qty_column, amount_column,
-            total_amount_column, email_column, product_column
+        previous_kpis = (
+            table.get(previous_year)
+            or KPIResult(0.0, 0, 0.0, 0, 0, 0, previous_year)
         )
 
         # Check if previous year has data
         has_previous_data = previous_kpis['num_transactions'] > 0
 
         if not has_previous_data:
-            logger.info(
-                f"calculate_kpis_with_yoy_comparison: No data for previous year {previous_year}"
+            logger.debug(
+                "calculate_kpis_with_yoy_comparison: No data for previous year %s",
+                previous_year
             )
             return {
                 'current': current_kpis,
@@ -639,39 +1139,22 @@ def calculate_kpis_with_yoy_comparison(
                 }
             }
 
-        # Calculate percentage changes
+        # Calculate percentage changes for every metric in one sweep
         comparison = {
-            'total_revenue_change': calculate_percentage_change(
-                current_kpis['total_revenue'],
-                previous_kpis['total_revenue']
-            ),
-            'total_quantity_change': calculate_percentage_change(
-                current_kpis['total_quantity'],
-                previous_kpis['total_quantity']
-            ),
-            'avg_transaction_value_change': calculate_percentage_change(
-                current_kpis['avg_transaction_value'],
-                previous_kpis['avg_transaction_value']
-            ),
-            'num_transactions_change': calculate_percentage_change(
-                current_kpis['num_transactions'],
-                previous_kpis['num_transactions']
-            ),
-            'unique_customers_change': calculate_percentage_change(
-                current_kpis['unique_customers'],
-                previous_kpis['unique_customers']
-            ),
-            'unique_products_change': calculate_percentage_change(
-                current_kpis['unique_products'],
-                previous_kpis['unique_products']
+            f'{metric}_change': calculate_percentage_change(
+                current_kpis[metric], previous_kpis[metric]
+            )
+            for metric in (
+                'total_revenue', 'total_quantity', 'avg_transaction_value',
+                'num_transactions', 'unique_customers', 'unique_products'
             )
         }
 
-        logger.info(
-            f"calculate_kpis_with_yoy_comparison: {current_year} vs {previous_year} - "
-            f"Revenue change: {comparison['total_revenue_change']:+.2f}% "
-            if comparison['total_revenue_change'] is not None else "N/A"
-        )
+        if comparison['total_revenue_change'] is not None:
+            logger.debug(
+                "calculate_kpis_with_yoy_comparison: %s vs %s - Revenue change: %+.2f%%",
+                current_year, previous_year, comparison['total_revenue_change']
+            )
 
         return {
             'current': current_kpis,
@@ -687,6 +1170,7 @@ def calculate_kpis_with_yoy_comparison(
         raise KPIError(error_msg)
 
 
+@empty_returns([])
 def get_available_years(
     df: pd.DataFrame,
     year_column: str = 'invoice_year'
@@ -708,11 +1192,6 @@ def get_available_years(
         >>> years = get_available_years(df)
         >>> print(f"Available years: {years}")  # [1970, 1971, ..., 2022]
     """
-    # Handle None or empty DataFrame
-    if df is None or df.empty:
-        logger.info("get_available_years: Empty DataFrame, returning empty list")
-        return []
-
     # Check if year column exists
     if year_column not in df.columns:
         error_msg = (
@@ -722,10 +1201,33 @@ def get_available_years(
         logger.error(error_msg)
         raise KPIError(error_msg)
 
+    cache_key = (id(df), len(df), year_column)
+    cached = _years_cache.get(cache_key)
+    if cached is not None:
+        _years_cache.move_to_end(cache_key)
+        return list(cached)
+
     try:
-        years = sorted(df[year_column].unique().tolist())
-        logger.debug(f"get_available_years: Found {len(years)} years")
-        return years
+        col = df[year_column]
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            # Categories are already deduplicated; only the observed ones
+            # count, and their codes are tiny ints
+            codes = np.unique(col.cat.codes.to_numpy())
+            years_arr = col.cat.categories.to_numpy()[codes[codes >= 0]]
+        else:
+            # np.unique sorts and deduplicates in one C pass, avoiding
+            # the Python-level sorted() over boxed ints
+            years_arr = np.unique(col.to_numpy())
+        years = years_arr.tolist()
+        logger.debug("get_available_years: Found %d years", len(years))
+
+        _years_cache[cache_key] = years
+        weakref.finalize(df, _years_cache.pop, cache_key, None)
+        if len(_years_cache) > _YEARS_CACHE_MAXSIZE:
+            _years_cache.popitem(last=False)
+
+        # Hand back a copy so callers can't mutate the cached list
+        return list(years)
     except Exception as e:
         error_msg = f"Error getting available years: {e}"
         logger.error(error_msg)
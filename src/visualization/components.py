@@ -9,10 +9,570 @@ Responsible for:
 """
 
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
 import pandas as pd
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+
+# Plotly imports take hundreds of ms on a cold worker; defer them until the
+# first chart actually renders. lru_cache makes the helpers free afterwards.
+@lru_cache(maxsize=1)
+def _go():
+    import plotly.graph_objects as go
+    _register_invoice_template()
+    return go
+
+
+@lru_cache(maxsize=1)
+def _register_invoice_template():
+    """
+    Register the shared light-theme layout template on first use.
+
+    The figure builders pass the template by name instead of rebuilding the
+    same layout dicts through the Plotly validator on every call.
+    """
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    pio.templates['invoice'] = go.layout.Template(layout=go.Layout(
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(family="Arial, sans-serif", size=12),
+        title_font_size=16,
+        hovermode='x unified',
+        xaxis=dict(showgrid=True, gridcolor='lightgray'),
+        yaxis=dict(showgrid=True, gridcolor='lightgray')
+    ))
+
+    # Power BI-style black/yellow theme shared by the trend charts
+    dark_axis = dict(
+        title_font=dict(color='#FFC000', size=14),
+        showgrid=True,
+        gridcolor='#404040',
+        gridwidth=1,
+        tickfont=dict(color='#FFFFFF')
+    )
+    pio.templates['invoice_powerbi'] = go.layout.Template(layout=go.Layout(
+        hovermode='x unified',
+        plot_bgcolor='#1C1C1C',
+        paper_bgcolor='#000000',
+        font=dict(family="Arial, sans-serif", size=12, color='#FFFFFF'),
+        title_font=dict(size=20, color='#FFC000', family="Arial, sans-serif"),
+        title_x=0.05,
+        xaxis=dark_axis,
+        yaxis=dark_axis,
+        margin=dict(l=60, r=30, t=60, b=60),
+        hoverlabel=dict(
+            bgcolor='#2D2D2D',
+            font_size=13,
+            font_family="Arial, sans-serif",
+            font_color='#FFFFFF'
+        )
+    ))
+
+
+def _lttb_downsample(
+    data: pd.DataFrame,
+    x_col: str,
+    y_col: str,
+    max_points: int
+) -> pd.DataFrame:
+    """
+    Downsample a time series using Largest-Triangle-Three-Buckets (LTTB).
+
+    LTTB keeps the points that contribute most to the visual shape of the
+    series, so a few thousand points render indistinguishably from the full
+    data while the JSON payload shrinks proportionally.
+
+    Args:
+        data (pd.DataFrame): Source data, assumed ordered by x_col
+        x_col (str): Column name for x-axis
+        y_col (str): Column name for y-axis
+        max_points (int): Target number of points to keep
+
+    Returns:
+        pd.DataFrame: Row subset of ``data`` with at most max_points rows
+    """
+    n = len(data)
+    if n <= max_points or max_points < 3:
+        return data
+
+    x = np.arange(n, dtype=np.float64)
+    y = data[y_col].to_numpy(dtype=np.float64, copy=False)
+
+    # First and last points are always kept; bucket the interior
+    n_buckets = max_points - 2
+    edges = np.linspace(1, n - 1, n_buckets + 1).astype(np.intp)
+
+    selected = np.empty(max_points, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    prev_idx = 0
+    for i in range(n_buckets):
+        lo, hi = edges[i], edges[i + 1]
+        if hi <= lo:
+            selected[i + 1] = lo
+            continue
+
+        # Average of the next bucket acts as the third triangle vertex
+        nlo, nhi = edges[i + 1], edges[min(i + 2, n_buckets)]
+        if nhi <= nlo:
+            nhi = nlo + 1
+        avg_x = x[nlo:nhi].mean()
+        avg_y = y[nlo:nhi].mean()
+
+        # Pick the bucket point forming the largest triangle with the
+        # previously selected point and the next bucket's average
+        areas = np.abs(
+            (x[prev_idx] - avg_x) * (y[lo:hi] - y[prev_idx])
+            - (x[prev_idx] - x[lo:hi]) * (avg_y - y[prev_idx])
+        )
+        prev_idx = lo + int(np.argmax(areas))
+        selected[i + 1] = prev_idx
+
+    return data.iloc[selected]
+
+
+def _pool_heatmap_rows(
+    z: np.ndarray,
+    y_labels: np.ndarray,
+    max_cells: int = 40_000
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Coarsen an oversized heatmap by summing blocks of adjacent rows.
+
+    Huge pivots (many products) cost the front end one cell per value;
+    pooling rows keeps the revenue totals meaningful while bounding the
+    number of cells shipped to the browser.
+
+    Args:
+        z (np.ndarray): 2-D value matrix (rows x columns)
+        y_labels (np.ndarray): One label per row
+        max_cells (int): Upper bound on cells in the returned matrix
+
+    Returns:
+        Tuple[np.ndarray, List[str]]: Pooled matrix and row-range labels
+    """
+    rows, cols = z.shape
+    target_rows = max(1, max_cells // max(cols, 1))
+    if rows <= target_rows:
+        return z, list(y_labels)
+
+    stride = -(-rows // target_rows)
+    pad = -rows % stride
+    padded = np.pad(z, ((0, pad), (0, 0)))
+    pooled = padded.reshape(-1, stride, cols).sum(axis=1)
+
+    labels = [
+        f"{y_labels[i]}–{y_labels[min(i + stride, rows) - 1]}"
+        for i in range(0, rows, stride)
+    ]
+    return pooled, labels
+
+
+def _downcast_numeric(arr: np.ndarray) -> np.ndarray:
+    """
+    Downcast wide numeric arrays before they are serialized into a figure.
+
+    Display precision never needs 64 bits; float32/int32 halve the payload
+    Plotly encodes and the browser decodes. Non-numeric dtypes pass through.
+    """
+    if arr.dtype.kind == 'f' and arr.dtype.itemsize > 4:
+        return arr.astype(np.float32)
+    if arr.dtype.kind in 'iu' and arr.dtype.itemsize > 4:
+        return arr.astype(np.int32)
+    return arr
+
+
+def _sample_colorscale(values: np.ndarray, color_scale: str) -> List[str]:
+    """
+    Map values onto a named Plotly colorscale with vectorized interpolation.
+
+    Precomputing a plain color list lets go.Bar skip the continuous
+    coloraxis machinery (and its per-value mapping) entirely.
+
+    Args:
+        values (np.ndarray): Numeric values to map
+        color_scale (str): Plotly colorscale name, e.g. 'Blues'
+
+    Returns:
+        List[str]: One 'rgb(r,g,b)' string per value
+    """
+    import plotly.colors as pc
+
+    stops = pc.get_colorscale(color_scale)
+    positions = np.array([s[0] for s in stops], dtype=np.float64)
+    channels = np.array([
+        pc.unlabel_rgb(pc.convert_colors_to_same_type([s[1]], 'rgb')[0][0])
+        for s in stops
+    ], dtype=np.float64)
+
+    vals = np.asarray(values, dtype=np.float64)
+    span = vals.max() - vals.min()
+    norm = (vals - vals.min()) / span if span > 0 else np.zeros_like(vals)
+
+    r = np.interp(norm, positions, channels[:, 0])
+    g = np.interp(norm, positions, channels[:, 1])
+    b = np.interp(norm, positions, channels[:, 2])
+
+    return [f'rgb({int(ri)},{int(gi)},{int(bi)})' for ri, gi, bi in zip(r, g, b)]
+
+
+@lru_cache(maxsize=512)
+def _format_kpi(
+    value: float,
+    format_string: str,
+    delta: Optional[float]
+) -> Tuple[str, Optional[str]]:
+    """Format a KPI value/delta pair once per distinct input across reruns."""
+    formatted_value = format_string.format(value)
+    formatted_delta = f"{delta:+.2f}%" if delta is not None else None
+    return formatted_value, formatted_delta
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _button_labels(options: tuple) -> dict:
+    """Precompute (selected, unselected) button labels for a set of options."""
+    return {option: (f"\u2713 {option}", f"{option}") for option in options}
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _top_filter_products(fingerprint: tuple, _transformer, n: int = 15) -> list:
+    """
+    Memoize the filter bar's top-product list across reruns.
+
+    Keyed on the transformer's cheap data fingerprint (the transformer
+    itself is excluded from hashing), so filter-button presses reuse the
+    computed top-N instead of re-aggregating per rerun.
+    """
+    return _transformer.get_top_products_for_filter(n=n)
+
+
+@st.cache_data(show_spinner=False)
+def _build_line_figure(
+    data: pd.DataFrame,
+    x_col: str,
+    y_col: str,
+    title: str,
+    x_label: str,
+    y_label: str,
+    color: str,
+    height: int
+) -> dict:
+    """Build the line chart as a plotly JSON spec; cached across reruns."""
+    go = _go()
+    # Scattergl renders via WebGL on the client; skip_invalid bypasses
+    # per-attribute schema validation during construction. Markers are only
+    # worth their per-point render cost on short series.
+    mode = 'lines+markers' if len(data) <= 200 else 'lines'
+    fig = go.Figure(
+        data=[go.Scattergl(
+            x=_downcast_numeric(data[x_col].to_numpy(copy=False)),
+            y=_downcast_numeric(data[y_col].to_numpy(copy=False)),
+            mode=mode,
+            line=dict(color=color, width=2),
+            marker=dict(size=8)
+        )],
+        layout=go.Layout(
+            template='invoice',
+            title=title,
+            xaxis_title=x_label,
+            yaxis_title=y_label,
+            height=height,
+            autosize=False
+        ),
+        skip_invalid=True
+    )
+
+    # Pre-convert to a plain dict so cache replays skip Figure validation
+    return fig.to_plotly_json()
+
+
+@st.cache_data(show_spinner=False)
+def _build_bar_figure(
+    data: pd.DataFrame,
+    x_col: str,
+    y_col: str,
+    title: str,
+    x_label: str,
+    y_label: str,
+    orientation: str,
+    color_scale: str,
+    height: int
+) -> dict:
+    """Build the bar chart as a plotly JSON spec; cached across reruns."""
+    go = _go()
+    # go.Bar on pre-aggregated arrays skips Plotly Express's trace inference
+    # and internal groupby/copies
+    x_vals = _downcast_numeric(data[x_col].to_numpy(copy=False))
+    y_vals = _downcast_numeric(data[y_col].to_numpy(copy=False))
+
+    fig = go.Figure(go.Bar(
+        x=x_vals if orientation == 'v' else y_vals,
+        y=y_vals if orientation == 'v' else x_vals,
+        orientation=orientation,
+        marker_color=_sample_colorscale(y_vals, color_scale)
+    ))
+
+    fig.update_layout(
+        template='invoice',
+        title=title,
+        xaxis_title=x_label if orientation == 'v' else y_label,
+        yaxis_title=y_label if orientation == 'v' else x_label,
+        showlegend=False,
+        height=height,
+        autosize=False
+    )
+
+    # Pre-convert to a plain dict so cache replays skip Figure validation
+    return fig.to_plotly_json()
+
+
+@st.cache_data(show_spinner=False)
+def _build_area_figure(
+    data: pd.DataFrame,
+    x_col: str,
+    y_col: str,
+    title: str,
+    x_label: str,
+    y_label: str,
+    color: str,
+    height: int
+) -> dict:
+    """Build the area chart as a plotly JSON spec; cached across reruns."""
+    go = _go()
+    # Scattergl with a tozeroy fill replaces px.area; skip_invalid bypasses
+    # per-attribute schema validation during construction
+    fig = go.Figure(
+        data=[go.Scattergl(
+            x=_downcast_numeric(data[x_col].to_numpy(copy=False)),
+            y=_downcast_numeric(data[y_col].to_numpy(copy=False)),
+            mode='lines',
+            fill='tozeroy',
+            line=dict(color=color),
+            fillcolor=color,
+            opacity=0.6,
+            hovertemplate='<b>%{x|%Y-%m-%d}</b><br>Volume: %{y:,}<extra></extra>'
+        )],
+        layout=go.Layout(
+            template='invoice',
+            title=title,
+            xaxis=dict(
+                title=x_label,
+                rangeslider=dict(visible=False)
+            ),
+            yaxis=dict(
+                title=y_label,
+                rangemode='tozero'
+            ),
+            dragmode='zoom',
+            modebar=dict(
+                orientation='h',
+                bgcolor='rgba(255,255,255,0.7)',
+                activecolor='#4A90E2'
+            ),
+            height=height,
+            autosize=False
+        ),
+        skip_invalid=True
+    )
+
+    # Pre-convert to a plain dict so cache replays skip Figure validation
+    return fig.to_plotly_json()
+
+
+@st.cache_data(show_spinner=False)
+def _build_heatmap_figure(
+    z: np.ndarray,
+    x_labels: np.ndarray,
+    y_labels: np.ndarray,
+    title: str,
+    x_label: str,
+    y_label: str,
+    color_scale: str,
+    height: int
+) -> dict:
+    """
+    Build the heatmap as a plotly JSON spec; cached across reruns.
+
+    The color range is pinned to [min, 99th percentile]: revenue grids are
+    dominated by a few outlier cells, which would otherwise wash out the
+    scale. Outliers above the cap keep their hover value but render at the
+    top color. Explicit zmin/zmax also spare the browser a min/max pass.
+    """
+    go = _go()
+
+    # Preformat hover text server-side (broadcast row/column parts over the
+    # grid) so the browser shows a ready string instead of evaluating the
+    # x/y/z hovertemplate substitutions per cell
+    col_part = np.array([f"Year: {x}<br>" for x in x_labels], dtype=object)
+    row_part = np.array([f"Product: {y}<br>" for y in y_labels], dtype=object)
+    val_part = np.array(
+        [f"Revenue: ${v:,.2f}" for v in np.asarray(z).ravel()],
+        dtype=object
+    ).reshape(np.shape(z))
+    hover_text = col_part[None, :] + row_part[:, None] + val_part
+
+    # float32 halves the serialized payload; display precision is unaffected
+    z = np.ascontiguousarray(z, dtype=np.float32)
+
+    fig = go.Figure(data=go.Heatmap(
+        z=z,
+        zmin=float(np.nanmin(z)) if z.size else 0.0,
+        zmax=float(np.nanpercentile(z, 99)) if z.size else 1.0,
+        x=x_labels,
+        y=y_labels,
+        colorscale=color_scale,
+        hoverongaps=False,
+        text=hover_text,
+        hovertemplate='%{text}<extra></extra>'
+    ))
+
+    fig.update_layout(
+        template='invoice',
+        title=title,
+        xaxis_title=x_label,
+        yaxis_title=y_label,
+        hovermode='closest',
+        height=height,
+        autosize=False
+    )
+
+    # Pre-convert to a plain dict so cache replays skip Figure validation
+    return fig.to_plotly_json()
+
+
+@st.cache_data(show_spinner=False)
+def _build_yearly_trend_figure(
+    data: pd.DataFrame,
+    x_col: str,
+    y_col: str,
+    title: str,
+    color: str,
+    y_title: str,
+    tickformat: str,
+    hovertemplate: str
+) -> dict:
+    """
+    Build a Power BI style yearly trend chart as a plotly JSON spec.
+
+    One parameterized builder backs both the revenue and quantity trend
+    charts; only the y-axis title, tick format and hover template differ.
+    Cached across reruns.
+    """
+    go = _go()
+
+    # Build the Power BI style trace directly from arrays, skipping the
+    # px.line dataframe-inference pipeline
+    fig = go.Figure(data=go.Scatter(
+        x=_downcast_numeric(data[x_col].to_numpy(copy=False)),
+        y=_downcast_numeric(data[y_col].to_numpy(copy=False)),
+        mode='lines+markers',
+        line=dict(color=color, width=4),
+        marker=dict(size=12, line=dict(width=2, color='#000000')),
+        hovertemplate=hovertemplate
+    ))
+
+    # Power BI black/yellow theme lives in the shared template; only the
+    # chart-specific axis settings are validated per call
+    fig.update_layout(
+        template='invoice_powerbi',
+        title=title,
+        xaxis=dict(title="Year", dtick=1, tickmode='linear'),
+        yaxis=dict(
+            title=y_title,
+            tickformat=tickformat,
+            rangemode='tozero'  # Trends start from zero
+        )
+    )
+
+    # Pre-convert to a plain dict so cache replays skip Figure validation
+    return fig.to_plotly_json()
+
+
+@st.cache_data(show_spinner=False)
+def _build_multi_product_figure(
+    data: pd.DataFrame,
+    title: str,
+    y_metric: str
+) -> dict:
+    """Build the multi-product chart as a plotly JSON spec; cached across reruns."""
+    go = _go()
+    import plotly.colors as pc
+
+    # One WebGL trace with NaN-separated segments per product replaces a
+    # trace per product_id: the JSON payload and front-end layering cost
+    # stay flat no matter how many products are compared
+    palette = pc.qualitative.Plotly
+    xs, ys, point_colors, point_labels, products = [], [], [], [], []
+    for i, (product_id, group) in enumerate(
+        data.groupby('product_id', observed=True, sort=False)
+    ):
+        color = palette[i % len(palette)]
+        n = len(group)
+        xs.append(np.append(group['invoice_year'].to_numpy(), np.nan))
+        ys.append(np.append(group[y_metric].to_numpy(dtype=np.float64), np.nan))
+        point_colors.extend([color] * (n + 1))
+        point_labels.extend([str(product_id)] * (n + 1))
+        products.append((product_id, color))
+
+    fig = go.Figure(go.Scattergl(
+        x=np.concatenate(xs),
+        y=np.concatenate(ys),
+        mode='lines+markers',
+        line=dict(width=2.5, color='rgba(0,0,0,0.25)'),
+        marker=dict(size=8, color=point_colors, line=dict(width=1.5, color='white')),
+        text=point_labels,
+        showlegend=False,
+        hovertemplate='<b>Product %{text}</b><br>Year: %{x}<br>Revenue: $%{y:,.2f}<extra></extra>'
+    ))
+
+    # Zero-length traces carry the per-product legend entries
+    for product_id, color in products:
+        fig.add_trace(go.Scattergl(
+            x=[None],
+            y=[None],
+            mode='lines+markers',
+            name=str(product_id),
+            line=dict(width=2.5, color=color),
+            marker=dict(size=8, color=color),
+            showlegend=True
+        ))
+
+    # Update layout
+    fig.update_layout(
+        title=title,
+        template='invoice',
+        xaxis=dict(
+            title='Year',
+            dtick=1
+        ),
+        yaxis=dict(
+            title='Revenue ($)',
+            tickformat='$,.0f',
+            rangemode='tozero'
+        ),
+        hovermode='x unified',
+        legend=dict(
+            title='Product ID',
+            orientation='v',
+            yanchor='top',
+            y=1,
+            xanchor='left',
+            x=1.02,
+            bgcolor='rgba(255,255,255,0.8)',
+            bordercolor='lightgray',
+            borderwidth=1
+        ),
+        legend_itemclick='toggle',
+        legend_itemdoubleclick='toggleothers'
+    )
+
+    # Pre-convert to a plain dict so cache replays skip the per-trace
+    # to_plotly_json walk, the dominant cost for many product traces
+    return fig.to_plotly_json()
 
 
 class DashboardComponents:
@@ -41,19 +601,41 @@ class DashboardComponents:
             delta (Optional[float]): Percentage change from previous period
             delta_color (str): Color scheme for delta ("normal", "inverse", "off")
         """
-        formatted_value = format_string.format(value)
+        # Round the cache key so float noise doesn't defeat memoization
+        formatted_value, formatted_delta = _format_kpi(
+            round(value, 6),
+            format_string,
+            round(delta, 6) if delta is not None else None
+        )
 
-        if delta is not None:
+        if formatted_delta is not None:
             st.metric(
                 label=title,
                 value=formatted_value,
-                delta=f"{delta:+.2f}%",
+                delta=formatted_delta,
                 delta_color=delta_color
             )
         else:
             st.metric(label=title, value=formatted_value)
 
     @staticmethod
+    def render_kpi_row(cards: List[dict]) -> None:
+        """
+        Render a row of KPI cards in equal-width columns.
+
+        One call replaces the per-card column/with-block boilerplate at the
+        call site and emits the metric widgets as a single batch.
+
+        Args:
+            cards (List[dict]): One dict of render_kpi_card kwargs per card
+        """
+        cols = st.columns(len(cards))
+        for col, card in zip(cols, cards):
+            with col:
+                DashboardComponents.render_kpi_card(**card)
+
+    @staticmethod
+    @st.fragment
     def render_line_chart(
         data: pd.DataFrame,
         x_col: str,
@@ -61,11 +643,16 @@ class DashboardComponents:
         title: str,
         x_label: str,
         y_label: str,
-        color: str = "#1F4E78"
+        color: str = "#1F4E78",
+        max_points: int = 2000,
+        height: int = 380
     ) -> None:
         """
         Render an interactive line chart.
 
+        Series longer than max_points are downsampled with LTTB before
+        plotting, which keeps the visual shape while bounding payload size.
+
         Args:
             data (pd.DataFrame): Data to plot
             x_col (str): Column name for x-axis
@@ -74,39 +661,25 @@ class DashboardComponents:
             x_label (str): X-axis label
             y_label (str): Y-axis label
             color (str): Line color
+            max_points (int): Maximum number of points to send to the browser
+            height (int): Fixed chart height in pixels
         """
-        if data.empty:
+        if len(data) == 0:
             st.info("No data available for the selected filters")
             return
 
-        fig = px.line(
-            data,
-            x=x_col,
-            y=y_col,
-            title=title,
-            labels={x_col: x_label, y_col: y_label},
-            markers=True
-        )
+        data = _lttb_downsample(data, x_col, y_col, max_points)
 
-        fig.update_traces(
-            line_color=color,
-            line_width=2,
-            marker=dict(size=8)
+        fig = _build_line_figure(
+            data, x_col, y_col, title, x_label, y_label, color, height
         )
 
-        fig.update_layout(
-            hovermode='x unified',
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            font=dict(family="Arial, sans-serif", size=12),
-            title_font_size=16,
-            xaxis=dict(showgrid=True, gridcolor='lightgray'),
-            yaxis=dict(showgrid=True, gridcolor='lightgray')
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
+        # Fixed size + theme=None skips the ResizeObserver relayouts and
+        # Streamlit's per-render theme override pass
+        st.plotly_chart(fig, use_container_width=False, theme=None)
 
     @staticmethod
+    @st.fragment
     def render_bar_chart(
         data: pd.DataFrame,
         x_col: str,
@@ -115,7 +688,8 @@ class DashboardComponents:
         x_label: str,
         y_label: str,
         orientation: str = 'h',
-        color_scale: str = 'Blues'
+        color_scale: str = 'Blues',
+        height: int = 380
     ) -> None:
         """
         Render an interactive bar chart.
@@ -129,35 +703,21 @@ class DashboardComponents:
             y_label (str): Y-axis label
             orientation (str): 'h' for horizontal, 'v' for vertical
             color_scale (str): Plotly color scale name
+            height (int): Fixed chart height in pixels
         """
-        if data.empty:
+        if len(data) == 0:
             st.info("No data available for the selected filters")
             return
 
-        fig = px.bar(
-            data,
-            x=x_col if orientation == 'v' else y_col,
-            y=y_col if orientation == 'v' else x_col,
-            title=title,
-            labels={x_col: x_label, y_col: y_label},
-            orientation=orientation,
-            color=y_col if orientation == 'v' else x_col,
-            color_continuous_scale=color_scale
+        fig = _build_bar_figure(
+            data, x_col, y_col, title, x_label, y_label, orientation, color_scale,
+            height
         )
 
-        fig.update_layout(
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            font=dict(family="Arial, sans-serif", size=12),
-            title_font_size=16,
-            xaxis=dict(showgrid=True, gridcolor='lightgray'),
-            yaxis=dict(showgrid=True, gridcolor='lightgray'),
-            showlegend=False
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig, use_container_width=False, theme=None)
 
     @staticmethod
+    @st.fragment
     def render_area_chart(
         data: pd.DataFrame,
         x_col: str,
@@ -165,7 +725,9 @@ class DashboardComponents:
         title: str,
         x_label: str,
         y_label: str,
-        color: str = "#4A90E2"
+        color: str = "#4A90E2",
+        max_points: int = 2000,
+        height: int = 380
     ) -> None:
         """
         Render an interactive area chart with zoom and pan capabilities.
@@ -184,98 +746,104 @@ class DashboardComponents:
             x_label (str): X-axis label
             y_label (str): Y-axis label
             color (str): Fill color (default: #4A90E2 - light blue)
+            max_points (int): Maximum number of points to send to the browser
+            height (int): Fixed chart height in pixels
         """
-        if data.empty:
+        if len(data) == 0:
             st.info("No data available for the selected filters")
             return
 
-        fig = px.area(
-            data,
-            x=x_col,
-            y=y_col,
-            title=title,
-            labels={x_col: x_label, y_col: y_label}
-        )
+        data = _lttb_downsample(data, x_col, y_col, max_points)
 
-        fig.update_traces(
-            line_color=color,
-            fillcolor=color,
-            opacity=0.6,
-            hovertemplate='<b>%{x|%Y-%m-%d}</b><br>Volume: %{y:,}<extra></extra>'
+        fig = _build_area_figure(
+            data, x_col, y_col, title, x_label, y_label, color, height
         )
 
-        fig.update_layout(
-            hovermode='x unified',
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            font=dict(family="Arial, sans-serif", size=12),
-            title_font_size=16,
-            xaxis=dict(
-                showgrid=True,
-                gridcolor='lightgray',
-                title=x_label,
-                rangeslider=dict(visible=False)
-            ),
-            yaxis=dict(
-                showgrid=True,
-                gridcolor='lightgray',
-                title=y_label,
-                rangemode='tozero'
-            ),
-            dragmode='zoom',
-            modebar=dict(
-                orientation='h',
-                bgcolor='rgba(255,255,255,0.7)',
-                activecolor='#4A90E2'
-            )
-        )
+        st.plotly_chart(fig, use_container_width=False, theme=None)
 
-        st.plotly_chart(fig, use_container_width=True)
+    @staticmethod
+    @st.cache_data(persist='disk', show_spinner=False)
+    def pivot_heatmap(
+        df: pd.DataFrame,
+        index: str = 'product_id',
+        columns: str = 'invoice_year',
+        values: str = 'total_amount'
+    ) -> pd.DataFrame:
+        """
+        Build the heatmap pivot table, cached to disk across sessions.
+
+        The pivot is the expensive part of rendering a heatmap; caching it
+        keyed on the source frame avoids re-aggregating on every rerun, and
+        disk persistence survives app restarts.
+
+        Args:
+            df (pd.DataFrame): Invoice-level data
+            index (str): Column for the pivot index (Y-axis)
+            columns (str): Column for the pivot columns (X-axis)
+            values (str): Column to aggregate
+
+        Returns:
+            pd.DataFrame: Pivot table of summed values with gaps filled as 0
+        """
+        return df.pivot_table(
+            index=index,
+            columns=columns,
+            values=values,
+            aggfunc='sum',
+            fill_value=0,
+            observed=True  # Skip unobserved category levels
+        )
 
     @staticmethod
+    @st.fragment
     def render_heatmap(
         data: pd.DataFrame,
         title: str,
         x_label: str = "Year",
         y_label: str = "Product ID",
-        color_scale: str = "Blues"
+        color_scale: str = "Blues",
+        height: int = 500
     ) -> None:
         """
         Render an interactive heatmap.
 
+        Accepts either a pivot-table DataFrame or, when the caller already
+        holds the raw arrays, a ``(z, x_labels, y_labels)`` tuple — the tuple
+        form skips the Index materialization a DataFrame round-trip costs.
+
         Args:
-            data (pd.DataFrame): Pivot table data
+            data: Pivot table DataFrame, or (z, x_labels, y_labels) tuple
             title (str): Chart title
             x_label (str): X-axis label
             y_label (str): Y-axis label
             color_scale (str): Plotly color scale name
+            height (int): Fixed chart height in pixels
         """
-        if data.empty:
+        if isinstance(data, pd.DataFrame):
+            z = data.to_numpy(copy=False)
+            x_labels = data.columns.to_numpy()
+            y_labels = data.index.to_numpy()
+        else:
+            z, x_labels, y_labels = data
+            z = np.asarray(z)
+
+        if z.size == 0:
             st.info("No data available for the selected filters")
             return
 
-        fig = go.Figure(data=go.Heatmap(
-            z=data.values,
-            x=data.columns,
-            y=data.index,
-            colorscale=color_scale,
-            hoverongaps=False,
-            hovertemplate='Year: %{x}<br>Product: %{y}<br>Revenue: $%{z:,.2f}<extra></extra>'
-        ))
+        # Bound the number of cells shipped to the browser; go.Heatmapgl was
+        # removed from Plotly, so oversized pivots are pooled instead
+        if z.size > 40_000:
+            z, y_labels = _pool_heatmap_rows(z, y_labels)
 
-        fig.update_layout(
-            title=title,
-            xaxis_title=x_label,
-            yaxis_title=y_label,
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            font=dict(family="Arial, sans-serif", size=12),
-            title_font_size=16
+        fig = _build_heatmap_figure(
+            z, x_labels, y_labels, title, x_label, y_label, color_scale, height
         )
 
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig, use_container_width=False, theme=None)
 
     @staticmethod
+    @st.fragment
     def render_revenue_trend_chart(
         data: pd.DataFrame,
         x_col: str = 'invoice_year',
@@ -302,67 +870,21 @@ class DashboardComponents:
             color (str): Line color (default: Power BI yellow #FFC000)
         """
         # Handle empty data
-        if data.empty:
+        if len(data) == 0:
             st.info("No data available for the selected filters")
             return
 
-        # Create the line chart with custom hover template
-        fig = px.line(
-            data,
-            x=x_col,
-            y=y_col,
-            title=title,
-            markers=True
-        )
-
-        # Update traces for Power BI style visualization
-        fig.update_traces(
-            line_color=color,
-            line_width=4,
-            marker=dict(size=12, line=dict(width=2, color='#000000')),
+        fig = _build_yearly_trend_figure(
+            data, x_col, y_col, title, color,
+            y_title="Total Revenue ($)",
+            tickformat='$,.0f',
             hovertemplate='<b>Year: %{x}</b><br>Revenue: $%{y:,.2f}<extra></extra>'
         )
 
-        # Update layout for Power BI black/yellow theme
-        fig.update_layout(
-            hovermode='x unified',
-            plot_bgcolor='#1C1C1C',
-            paper_bgcolor='#000000',
-            font=dict(family="Arial, sans-serif", size=12, color='#FFFFFF'),
-            title_font=dict(size=20, color='#FFC000', family="Arial, sans-serif"),
-            title_x=0.05,
-            xaxis=dict(
-                title="Year",
-                title_font=dict(color='#FFC000', size=14),
-                showgrid=True,
-                gridcolor='#404040',
-                gridwidth=1,
-                dtick=1,  # Show every year
-                tickmode='linear',
-                tickfont=dict(color='#FFFFFF')
-            ),
-            yaxis=dict(
-                title="Total Revenue ($)",
-                title_font=dict(color='#FFC000', size=14),
-                showgrid=True,
-                gridcolor='#404040',
-                gridwidth=1,
-                tickformat='$,.0f',  # Format as currency
-                rangemode='tozero',  # Start from zero for revenue
-                tickfont=dict(color='#FFFFFF')
-            ),
-            margin=dict(l=60, r=30, t=60, b=60),
-            hoverlabel=dict(
-                bgcolor='#2D2D2D',
-                font_size=13,
-                font_family="Arial, sans-serif",
-                font_color='#FFFFFF'
-            )
-        )
-
         st.plotly_chart(fig, use_container_width=True)
 
     @staticmethod
+    @st.fragment
     def render_quantity_trend_chart(
         data: pd.DataFrame,
         x_col: str = 'invoice_year',
@@ -384,70 +906,24 @@ class DashboardComponents:
             color (str): Line color (default: Light yellow #FFD740 to distinguish from revenue)
         """
         # Handle empty data
-        if data.empty:
+        if len(data) == 0:
             st.info("No data available for the selected filters")
             return
 
-        # Create the line chart with custom hover template
-        fig = px.line(
-            data,
-            x=x_col,
-            y=y_col,
-            title=title,
-            markers=True
-        )
-
-        # Update traces for Power BI style visualization
-        fig.update_traces(
-            line_color=color,
-            line_width=4,
-            marker=dict(size=12, line=dict(width=2, color='#000000')),
+        fig = _build_yearly_trend_figure(
+            data, x_col, y_col, title, color,
+            y_title="Total Quantity Sold (units)",
+            tickformat=',',
             hovertemplate='<b>Year: %{x}</b><br>Quantity: %{y:,} units<extra></extra>'
         )
 
-        # Update layout for Power BI black/yellow theme
-        fig.update_layout(
-            hovermode='x unified',
-            plot_bgcolor='#1C1C1C',
-            paper_bgcolor='#000000',
-            font=dict(family="Arial, sans-serif", size=12, color='#FFFFFF'),
-            title_font=dict(size=20, color='#FFC000', family="Arial, sans-serif"),
-            title_x=0.05,
-            xaxis=dict(
-                title="Year",
-                title_font=dict(color='#FFC000', size=14),
-                showgrid=True,
-                gridcolor='#404040',
-                gridwidth=1,
-                dtick=1,  # Show every year
-                tickmode='linear',
-                tickfont=dict(color='#FFFFFF')
-            ),
-            yaxis=dict(
-                title="Total Quantity Sold (units)",
-                title_font=dict(color='#FFC000', size=14),
-                showgrid=True,
-                gridcolor='#404040',
-                gridwidth=1,
-                tickformat=',',  # Format with thousand separators
-                rangemode='tozero',  # Start from zero for quantity
-                tickfont=dict(color='#FFFFFF')
-            ),
-            margin=dict(l=60, r=30, t=60, b=60),
-            hoverlabel=dict(
-                bgcolor='#2D2D2D',
-                font_size=13,
-                font_family="Arial, sans-serif",
-                font_color='#FFFFFF'
-            )
-        )
-
         st.plotly_chart(fig, use_container_width=True)
 
     @staticmethod
     def render_top_products_bar_chart(
         data: pd.DataFrame,
-        title: str = "Top 10 Products by Revenue"
+        title: str = "Top 10 Products by Revenue",
+        top_n: int = 10
     ) -> dict:
         """
         Render interactive horizontal bar chart for top products with click-to-filter.
@@ -463,51 +939,51 @@ class DashboardComponents:
         Args:
             data (pd.DataFrame): DataFrame with columns [product_id, total_revenue]
             title (str): Chart title (default: "Top 10 Products by Revenue")
+            top_n (int): Number of top products to display (default: 10)
 
         Returns:
             dict: Event data from st.plotly_chart for click handling, or None if data is empty
         """
-        if data.empty:
+        if len(data) == 0:
             st.info("No product data available for the selected filters")
             return None
 
-        # Sort ascending for horizontal bar display (bottom to top)
-        data = data.sort_values('total_revenue', ascending=True)
+        go = _go()
 
-        # Format product_id as string for better display
-        data['product_label'] = 'Product ' + data['product_id'].astype(str)
+        # Partial selection of the top N (heap-based, O(n) vs a full sort),
+        # reversed so the largest bar renders at the top
+        data = data.nlargest(top_n, 'total_revenue').iloc[::-1]
 
-        # Create horizontal bar chart
-        fig = px.bar(
-            data,
-            x='total_revenue',
-            y='product_label',
-            orientation='h',
-            color='total_revenue',
-            color_continuous_scale='Teal',
-            title=title,
-            labels={'total_revenue': 'Total Revenue ($)', 'product_label': 'Product'},
-            custom_data=['product_id']
-        )
+        # Format product_id as string for better display: one Python-level
+        # format per distinct id, then a numpy take back to row order
+        codes, uniques = pd.factorize(data['product_id'])
+        labels = np.array([f'Product {u}' for u in uniques], dtype=object)
 
-        # Update traces with custom tooltip
-        fig.update_traces(
-            hovertemplate='<b>%{y}</b><br>Revenue: $%{x:,.2f}<extra></extra>',
-            marker=dict(line=dict(width=0))
-        )
+        revenue = data['total_revenue'].to_numpy(copy=False)
+
+        # Create horizontal bar chart. Per-bar colors are sampled server-side
+        # so the figure carries no coloraxis/colorbar machinery in its JSON.
+        fig = go.Figure(data=go.Bar(
+            x=revenue,
+            y=labels[codes],
+            orientation='h',
+            marker=dict(
+                color=_sample_colorscale(revenue, 'Teal'),
+                line=dict(width=0)
+            ),
+            customdata=_downcast_numeric(data['product_id'].to_numpy(copy=False)).reshape(-1, 1),
+            hovertemplate='<b>%{y}</b><br>Revenue: $%{x:,.2f}<extra></extra>'
+        ))
 
         # Update layout
         fig.update_layout(
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            font=dict(family="Arial, sans-serif", size=12),
-            title_font_size=16,
+            template='invoice',
+            title=title,
             xaxis=dict(
-                showgrid=True,
-                gridcolor='lightgray',
+                title='Total Revenue ($)',
                 tickformat='$,.0f'
             ),
-            yaxis=dict(showgrid=False),
+            yaxis=dict(title='Product', showgrid=False),
             showlegend=False,
             height=400
         )
@@ -523,16 +999,20 @@ class DashboardComponents:
         return event
 
     @staticmethod
+    @st.fragment
     def render_multi_product_line_chart(
         data: pd.DataFrame,
         title: str = "Product Performance Comparison",
-        y_metric: str = 'revenue'
+        y_metric: str = 'revenue',
+        max_points: int = 2000
     ) -> None:
         """
         Render multi-product line chart with interactive legend.
 
         Each product is shown as a separate colored line. Users can click
-        legend items to toggle products on/off for comparison.
+        legend items to toggle products on/off for comparison. When the
+        combined data exceeds max_points, each product's series is LTTB
+        downsampled within a shared point budget before plotting.
 
         Args:
             data (pd.DataFrame): Multi-product data with columns:
@@ -541,14 +1021,29 @@ class DashboardComponents:
                 - revenue (or other metric): Y-axis values
             title (str): Chart title
             y_metric (str): Column name for Y-axis metric (default: 'revenue')
+            max_points (int): Total point budget across all product traces
         """
-        if data.empty:
+        if len(data) == 0:
             st.warning("No product performance data available.")
             return
 
-        # Count unique products for warning
+        # Categorical product ids: distinct-count and grouping run on the
+        # small dictionary instead of re-hashing the raw column
+        if data['product_id'].dtype.name != 'category':
+            data = data.assign(product_id=data['product_id'].astype('category'))
+
+        # nunique reads the observed codes: a pre-filtered categorical can
+        # carry the full catalog in .cat.categories, which would overcount
         num_products = data['product_id'].nunique()
 
+        # Downsample per product so no trace blows the shared point budget
+        if len(data) > max_points:
+            per_trace = max(3, max_points // num_products)
+            data = pd.concat([
+                _lttb_downsample(group, 'invoice_year', y_metric, per_trace)
+                for _, group in data.groupby('product_id', observed=True, sort=False)
+            ])
+
         # Show warning if many products
         if num_products > 10:
             st.warning(
@@ -556,64 +1051,83 @@ class DashboardComponents:
                 "Chart may be cluttered. Consider filtering to fewer products for clarity."
             )
 
-        # Create multi-trace line chart
-        fig = px.line(
-            data,
-            x='invoice_year',
-            y=y_metric,
-            color='product_id',
+        fig = _build_multi_product_figure(data, title, y_metric)
+
+        st.plotly_chart(fig, use_container_width=True)
+
+    @staticmethod
+    def render_heatmap_from_long(
+        df: pd.DataFrame,
+        title: str,
+        x: str = 'invoice_year',
+        y: str = 'product_id',
+        v: str = 'total_amount',
+        x_label: str = "Year",
+        y_label: str = "Product ID",
+        color_scale: str = "Blues",
+        height: int = 500
+    ) -> None:
+        """
+        Render a heatmap straight from long-format data.
+
+        Builds the z-matrix with factorize plus a vectorized scatter-add —
+        one O(N) pass over the rows — instead of requiring callers to run a
+        pivot_table first.
+
+        Args:
+            df (pd.DataFrame): Long-format data
+            title (str): Chart title
+            x (str): Column for the x-axis categories
+            y (str): Column for the y-axis categories
+            v (str): Column with the values to sum per cell
+            x_label (str): X-axis label
+            y_label (str): Y-axis label
+            color_scale (str): Plotly color scale name
+            height (int): Fixed chart height in pixels
+        """
+        if df is None or len(df) == 0:
+            st.info("No data available for the selected filters")
+            return
+
+        xi, xu = pd.factorize(df[x], sort=True)
+        yi, yu = pd.factorize(df[y], sort=True)
+
+        z = np.zeros((len(yu), len(xu)), dtype=np.float64)
+        np.add.at(z, (yi, xi), df[v].to_numpy(dtype=np.float64, copy=False))
+
+        DashboardComponents.render_heatmap(
+            (z, np.asarray(xu), np.asarray(yu)),
             title=title,
-            labels={
-                'invoice_year': 'Year',
-                y_metric: 'Revenue ($)' if y_metric == 'revenue' else y_metric.title(),
-                'product_id': 'Product ID'
-            },
-            markers=True
+            x_label=x_label,
+            y_label=y_label,
+            color_scale=color_scale,
+            height=height
         )
 
-        # Update traces for better visibility
-        fig.update_traces(
-            line=dict(width=2.5),
-            marker=dict(size=8, line=dict(width=1.5, color='white')),
-            hovertemplate='<b>Product %{fullData.name}</b><br>Year: %{x}<br>Revenue: $%{y:,.2f}<extra></extra>'
-        )
+    @staticmethod
+    @st.cache_data(show_spinner=False)
+    def available_options(df: pd.DataFrame) -> tuple:
+        """
+        Compute the year and product filter options from a DataFrame, cached.
 
-        # Update layout
-        fig.update_layout(
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            font=dict(family="Arial, sans-serif", size=12),
-            title_font_size=16,
-            xaxis=dict(
-                showgrid=True,
-                gridcolor='lightgray',
-                title='Year',
-                dtick=1
-            ),
-            yaxis=dict(
-                showgrid=True,
-                gridcolor='lightgray',
-                title='Revenue ($)',
-                tickformat='$,.0f',
-                rangemode='tozero'
-            ),
-            hovermode='x unified',
-            legend=dict(
-                title='Product ID',
-                orientation='v',
-                yanchor='top',
-                y=1,
-                xanchor='left',
-                x=1.02,
-                bgcolor='rgba(255,255,255,0.8)',
-                bordercolor='lightgray',
-                borderwidth=1
-            ),
-            legend_itemclick='toggle',
-            legend_itemdoubleclick='toggleothers'
-        )
+        Streamlit hashes the frame once, so subsequent reruns reuse the lists
+        instead of rescanning the columns on every widget interaction.
 
-        st.plotly_chart(fig, use_container_width=True)
+        Args:
+            df (pd.DataFrame): Frame with invoice_year and product_id columns
+
+        Returns:
+            tuple: (available_years, available_products), both sorted lists
+        """
+        years = pd.unique(df['invoice_year']).tolist()
+        if not df['invoice_year'].is_monotonic_increasing:
+            years.sort()
+
+        products = pd.unique(df['product_id']).tolist()
+        if not df['product_id'].is_monotonic_increasing:
+            products.sort()
+
+        return years, products
 
     @staticmethod
     def render_filters(
@@ -623,36 +1137,70 @@ class DashboardComponents:
         """
         Render filter components in the sidebar.
 
+        When every option is selected (the default), the corresponding entry
+        in the returned tuple is None, meaning "no filter" — callers can skip
+        the isin scan entirely instead of matching all rows.
+
         Args:
             available_years (List[int]): List of available years
             available_products (List[int]): List of available product IDs
 
         Returns:
-            tuple: (selected_years, selected_products)
+            tuple: (selected_years, selected_products); an entry is None when
+                all of its options are selected
         """
         st.sidebar.header("Filters")
 
-        # Year filter
+        # Widget keys derived from the option sets: once the widget exists in
+        # session_state, skip passing defaults so Streamlit doesn't re-validate
+        # them against the full option list on every rerun. A changed option
+        # set yields a fresh key and therefore a fresh widget.
+        year_key = f"filter_years_{hash(tuple(available_years))}"
+        product_key = f"filter_products_{hash(tuple(available_products))}"
+        year_default = available_years if year_key not in st.session_state else None
+
+        # Year filter — segmented control has a much lighter widget payload
+        # than multiselect for small option sets
         st.sidebar.subheader("Year Range")
-        selected_years = st.sidebar.multiselect(
-            "Select Years",
-            options=available_years,
-            default=available_years,
-            help="Select one or more years to filter the data"
-        )
+        if len(available_years) <= 12:
+            selected_years = st.sidebar.segmented_control(
+                "Select Years",
+                options=available_years,
+                default=year_default,
+                selection_mode='multi',
+                key=year_key,
+                help="Select one or more years to filter the data"
+            )
+        else:
+            selected_years = st.sidebar.multiselect(
+                "Select Years",
+                options=available_years,
+                default=year_default,
+                key=year_key,
+                help="Select one or more years to filter the data"
+            )
 
-        # Product filter
+        # Product filter — default to empty (meaning "all") so the full
+        # product list is not re-serialized to the front-end on every rerun
         st.sidebar.subheader("Products")
         selected_products = st.sidebar.multiselect(
             "Select Products",
             options=available_products,
-            default=available_products,
-            help="Select one or more product IDs to filter the data"
+            key=product_key,
+            help="Select product IDs to filter the data (empty = all products)"
         )
 
+        # All (or no) options selected means the filter is a no-op; signal
+        # that with None so callers can skip the isin scan
+        if not selected_years or set(selected_years) == set(available_years):
+            selected_years = None
+        if not selected_products or set(selected_products) == set(available_products):
+            selected_products = None
+
         return selected_years, selected_products
 
     @staticmethod
+    @st.fragment
     def render_button_filters(
         transformer,
         available_years: List[int],
@@ -664,6 +1212,11 @@ class DashboardComponents:
         This method creates toggle button filters for years, products, and aggregation level,
         replacing the traditional dropdown filters with a more interactive button-based interface.
 
+        The filter bar runs as a fragment: individual button toggles repaint
+        only the bar itself, and the Apply Filters button triggers the full
+        app rerun that rebuilds the charts — several clicks coalesce into a
+        single chart rebuild.
+
         Args:
             transformer: DataTransformer instance (used to get top products)
             available_years (List[int]): List of available years
@@ -673,10 +1226,11 @@ class DashboardComponents:
             tuple: (selected_years, selected_products, aggregation_level)
         """
         # Initialize session state for button filters
+        # Sets make the per-button membership checks and toggles O(1)
         if 'selected_years' not in st.session_state:
-            st.session_state.selected_years = available_years.copy()
+            st.session_state.selected_years = set(available_years)
         if 'selected_products' not in st.session_state:
-            st.session_state.selected_products = available_products.copy()
+            st.session_state.selected_products = set(available_products)
         if 'aggregation_level' not in st.session_state:
             st.session_state.aggregation_level = 'Daily'
         if 'show_all_products' not in st.session_state:
@@ -699,27 +1253,28 @@ class DashboardComponents:
         # "All Years" button
         with year_cols[0]:
             if st.button("All Years", key="year_all_btn", use_container_width=True):
-                st.session_state.selected_years = available_years.copy()
-                st.rerun()
+                st.session_state.selected_years = set(available_years)
+                st.rerun(scope='fragment')
 
         # Individual year buttons (show up to 9 years inline)
         years_to_show = available_years[:9] if len(available_years) > 9 else available_years
+        year_labels = _button_labels(tuple(years_to_show))
         for idx, year in enumerate(years_to_show):
             with year_cols[idx + 1]:
                 is_selected = year in st.session_state.selected_years
-                button_label = f"✓ {year}" if is_selected else str(year)
+                button_label = year_labels[year][0] if is_selected else year_labels[year][1]
 
                 # Apply active styling via inline style hack
                 if st.button(button_label, key=f"year_{year}", use_container_width=True):
                     if is_selected:
                         # Deselect
                         if len(st.session_state.selected_years) > 1:  # Keep at least one
-                            st.session_state.selected_years.remove(year)
-                            st.rerun()
+                            st.session_state.selected_years.discard(year)
+                            st.rerun(scope='fragment')
                     else:
                         # Select
-                        st.session_state.selected_years.append(year)
-                        st.rerun()
+                        st.session_state.selected_years.add(year)
+                        st.rerun(scope='fragment')
 
         # Clear All Years button
         with year_cols[10]:
@@ -727,8 +1282,8 @@ class DashboardComponents:
             with clear_col1:
                 if st.button("Clear All", key="year_clear", use_container_width=True):
                     # Keep at least one year selected
-                    st.session_state.selected_years = [available_years[0]]
-                    st.rerun()
+                    st.session_state.selected_years = {available_years[0]}
+                    st.rerun(scope='fragment')
 
         st.markdown('</div>', unsafe_allow_html=True)
         st.markdown("---")
@@ -741,56 +1296,61 @@ class DashboardComponents:
             unsafe_allow_html=True
         )
 
-        # Get top products for display
-        top_products = transformer.get_top_products_for_filter(n=15)
+        # Get top products for display (memoized across reruns)
+        top_products = _top_filter_products(transformer.data_fingerprint(), transformer, n=15)
         display_products = available_products if st.session_state.show_all_products else top_products
 
+        product_labels = _button_labels(tuple(display_products))
+
         # Product buttons - 5 per row
         num_cols = 5
         num_products = len(display_products)
         num_rows = (num_products + num_cols - 1) // num_cols
 
-        for row_idx in range(num_rows):
-            prod_cols = st.columns(num_cols)
-            start_idx = row_idx * num_cols
-            end_idx = min(start_idx + num_cols, num_products)
-
-            for col_idx, prod_idx in enumerate(range(start_idx, end_idx)):
-                product_id = display_products[prod_idx]
-                with prod_cols[col_idx]:
-                    is_selected = product_id in st.session_state.selected_products
-                    button_label = f"✓ {product_id}" if is_selected else f"{product_id}"
-
-                    if st.button(button_label, key=f"prod_{product_id}", use_container_width=True):
-                        if is_selected:
-                            # Deselect
-                            if len(st.session_state.selected_products) > 1:  # Keep at least one
-                                st.session_state.selected_products.remove(product_id)
-                                st.rerun()
-                        else:
-                            # Select
-                            st.session_state.selected_products.append(product_id)
-                            st.rerun()
+        # Build the whole grid in one st.columns call rather than one per row
+        all_cols = []
+        for _ in range(num_rows):
+            all_cols.extend(st.columns(num_cols))
+
+        for prod_idx in range(num_products):
+            product_id = display_products[prod_idx]
+            with all_cols[prod_idx]:
+                is_selected = product_id in st.session_state.selected_products
+                button_label = (
+                    product_labels[product_id][0] if is_selected
+                    else product_labels[product_id][1]
+                )
+
+                if st.button(button_label, key=f"prod_{product_id}", use_container_width=True):
+                    if is_selected:
+                        # Deselect
+                        if len(st.session_state.selected_products) > 1:  # Keep at least one
+                            st.session_state.selected_products.discard(product_id)
+                            st.rerun(scope='fragment')
+                    else:
+                        # Select
+                        st.session_state.selected_products.add(product_id)
+                        st.rerun(scope='fragment')
 
         # Action buttons row
         action_cols = st.columns([1, 1, 1, 1, 1])
         with action_cols[0]:
             if st.button("All Products", key="prod_all_btn", use_container_width=True):
-                st.session_state.selected_products = available_products.copy()
-                st.rerun()
+                st.session_state.selected_products = set(available_products)
+                st.rerun(scope='fragment')
 
         with action_cols[1]:
             if st.button("Clear All", key="prod_clear", use_container_width=True):
                 # Keep at least one product
-                st.session_state.selected_products = [available_products[0]]
-                st.rerun()
+                st.session_state.selected_products = {available_products[0]}
+                st.rerun(scope='fragment')
 
         with action_cols[2]:
             toggle_label = "Show Top 15" if st.session_state.show_all_products else "Show All Products"
             st.markdown('<div class="toggle-visibility-btn">', unsafe_allow_html=True)
             if st.button(toggle_label, key="prod_toggle", use_container_width=True):
                 st.session_state.show_all_products = not st.session_state.show_all_products
-                st.rerun()
+                st.rerun(scope='fragment')
             st.markdown('</div>', unsafe_allow_html=True)
 
         st.markdown('</div>', unsafe_allow_html=True)
@@ -813,13 +1373,19 @@ class DashboardComponents:
 
                 if st.button(button_label, key=f"agg_{option}", use_container_width=True):
                     st.session_state.aggregation_level = option
-                    st.rerun()
+                    st.rerun(scope='fragment')
 
         st.markdown('</div>', unsafe_allow_html=True)
+
+        # Button presses above rerun only this fragment; Apply propagates the
+        # accumulated selection to the rest of the app in one full rerun
+        if st.button("Apply Filters", key="filters_apply", type="primary"):
+            st.rerun(scope='app')
+
         st.markdown('</div>', unsafe_allow_html=True)  # Close filter-bar
 
         return (
-            st.session_state.selected_years,
-            st.session_state.selected_products,
+            sorted(st.session_state.selected_years),
+            sorted(st.session_state.selected_products),
             st.session_state.aggregation_level
         )
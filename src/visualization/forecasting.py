@@ -13,12 +13,13 @@ Features:
 
 import pickle
 import pandas as pd
-import plotly.graph_objects as go
 from pathlib import Path
 from typing import Tuple, Dict
 import streamlit as st
 from datetime import datetime, timedelta
 
+from .components import _go, _lttb_downsample
+
 
 class ForecastingComponents:
     """
@@ -66,20 +67,20 @@ class ForecastingComponents:
         Returns:
             pd.Series: Time series of daily total revenue
         """
-        # Ensure invoice_date is datetime
-        if not pd.api.types.is_datetime64_any_dtype(df['invoice_date']):
-            df = df.copy()
-            df['invoice_date'] = pd.to_datetime(df['invoice_date'], format='%d/%m/%Y')
-
-        # Calculate total_amount if not present
-        if 'total_amount' not in df.columns:
-            df = df.copy()
-            df['total_amount'] = df['qty'] * df['amount']
+        # Work on the two needed columns directly instead of copying the
+        # whole frame — this function only reads the data
+        dates = df['invoice_date']
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates, format='%d/%m/%Y')
+
+        if 'total_amount' in df.columns:
+            totals = df['total_amount']
+        else:
+            totals = df['qty'] * df['amount']
 
         # Aggregate by date
-        daily_data = df.groupby('invoice_date')['total_amount'].sum().reset_index()
-        daily_data.columns = ['date', 'value']
-        daily_data.set_index('date', inplace=True)
+        daily_data = totals.groupby(dates.to_numpy()).sum().to_frame('value')
+        daily_data.index.name = 'date'
 
         # Create full date range with missing dates filled as 0
         full_range = pd.date_range(
@@ -145,7 +146,8 @@ class ForecastingComponents:
         historical_series: pd.Series,
         forecast_df: pd.DataFrame,
         title: str = "Revenue Forecast",
-        show_historical_points: int = 365
+        show_historical_points: int = 365,
+        max_points: int = 2000
     ) -> None:
         """
         Render interactive forecast chart with historical data.
@@ -155,15 +157,26 @@ class ForecastingComponents:
             forecast_df (pd.DataFrame): Forecast dataframe with 'date' and 'forecast'
             title (str): Chart title
             show_historical_points (int): Number of historical days to show
+            max_points (int): LTTB point budget for the historical trace
         """
+        go = _go()
         fig = go.Figure()
 
         # Filter historical data to last N days for better visibility
         if len(historical_series) > show_historical_points:
             historical_series = historical_series.iloc[-show_historical_points:]
 
-        # Add historical data trace
-        fig.add_trace(go.Scatter(
+        # LTTB-downsample long histories so only the visually significant
+        # points are serialized into the figure; the forecast trace is small
+        # and stays untouched
+        if len(historical_series) > max_points:
+            hist_df = historical_series.rename('value').rename_axis('date').reset_index()
+            hist_df = _lttb_downsample(hist_df, 'date', 'value', max_points)
+            historical_series = hist_df.set_index('date')['value']
+
+        # Add historical data trace (Scattergl renders via WebGL, keeping
+        # pan/zoom smooth on dense daily series)
+        fig.add_trace(go.Scattergl(
             x=historical_series.index,
             y=historical_series.values,
             mode='lines',
@@ -176,7 +189,7 @@ class ForecastingComponents:
 
         # Add forecast trace
         if not forecast_df.empty:
-            fig.add_trace(go.Scatter(
+            fig.add_trace(go.Scattergl(
                 x=forecast_df['date'],
                 y=forecast_df['forecast'],
                 mode='lines+markers',
@@ -315,6 +328,7 @@ class ForecastingComponents:
             return
 
         # Create bar chart
+        go = _go()
         fig = go.Figure()
 
         fig.add_trace(go.Bar(
@@ -14,12 +14,13 @@ Features:
 
 import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
 from pathlib import Path
 from typing import Tuple, Dict, Optional
 import streamlit as st
 from datetime import datetime, timedelta
 
+from .components import _go
+
 
 class LSTMForecastingComponents:
     """
@@ -183,6 +184,7 @@ class LSTMForecastingComponents:
             title (str): Chart title
             show_historical_points (int): Number of historical days to show
         """
+        go = _go()
         fig = go.Figure()
 
         # Filter historical data to last N days for better visibility
@@ -411,6 +413,7 @@ class LSTMForecastingComponents:
             return
 
         # Create bar chart
+        go = _go()
         fig = go.Figure()
 
         fig.add_trace(go.Bar(
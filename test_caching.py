@@ -0,0 +1,307 @@
+"""
+Test Suite for Caching Behavior
+
+This script tests the stateful caching layers added around ingestion and
+the filter/KPI hot paths:
+- Parquet cache round-trip and mtime-based staleness detection (DataLoader)
+- Predicate pushdown in DataLoader.load_filtered
+- id-keyed LRU caches in filters/kpis with weakref eviction (a cached
+  entry must never be served for a different frame at a recycled id)
+"""
+
+import gc
+import os
+import sys
+import tempfile
+from pathlib import Path
+import pandas as pd
+import numpy as np
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent))
+
+from src.data import DataLoader
+from src.utils.filters import apply_combined_filters
+from src.utils.kpis import (
+    calculate_all_kpis,
+    calculate_kpis_for_year,
+    get_available_years
+)
+
+
+CSV_HEADER = "first_name,last_name,email,product_id,qty,amount,invoice_date\n"
+
+
+def write_sample_csv(path: Path, rows) -> None:
+    """Write a minimal valid invoice CSV; rows are (pid, qty, amount, date)."""
+    lines = [CSV_HEADER]
+    for i, (pid, qty, amount, date) in enumerate(rows):
+        lines.append(
+            f"First{i},Last{i},user{i}@example.com,{pid},{qty},{amount},{date}\n"
+        )
+    path.write_text("".join(lines))
+
+
+def test_parquet_cache_roundtrip():
+    """Test that a fresh Parquet cache is used and preserves dtypes/flags."""
+    print("\n" + "="*70)
+    print("TEST 1: Parquet Cache Round-Trip (dtypes and sort flag)")
+    print("="*70)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "invoices.csv"
+            write_sample_csv(csv_path, [
+                (101, 2, 10.5, "01/02/2020"),
+                (102, 1, 20.0, "15/06/2021"),
+                (101, 3, 5.25, "31/12/2021"),
+            ])
+
+            df_first = DataLoader(str(csv_path)).load_data()
+            cache_path = csv_path.with_suffix('.parquet')
+            assert cache_path.exists(), "Parquet cache was not written"
+
+            # Age the CSV so the cache reads as fresh, then corrupt it:
+            # if the reload still returns the original data, it came from
+            # the cache, not the CSV
+            os.utime(csv_path, (0, 0))
+            csv_path.write_text("corrupted")
+            os.utime(csv_path, (0, 0))
+
+            df_cached = DataLoader(str(csv_path)).load_data()
+            assert len(df_cached) == len(df_first), "Cache load lost rows"
+            assert df_cached['qty'].dtype == np.int32, "qty dtype not preserved"
+            assert df_cached['product_id'].dtype == np.int32, "product_id dtype not preserved"
+            assert df_cached['amount'].dtype == np.float32, "amount dtype not preserved"
+            assert str(df_cached['invoice_date'].dtype).startswith('datetime64'), \
+                "invoice_date dtype not preserved"
+            assert 'total_amount' in df_cached.columns, "total_amount not preserved"
+            assert df_cached.attrs.get('date_sorted') is True, "date_sorted flag not restored"
+            assert df_cached['invoice_date'].is_monotonic_increasing, "cache lost sort order"
+
+        print(f"[PASS] Reload served from cache with final dtypes")
+        print(f"[PASS] date_sorted flag restored after Parquet round-trip")
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] {str(e)}")
+        return False
+
+
+def test_stale_csv_invalidates_cache():
+    """Test that a CSV newer than the cache forces full re-ingestion."""
+    print("\n" + "="*70)
+    print("TEST 2: Stale Parquet Cache Invalidated by Newer CSV")
+    print("="*70)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "invoices.csv"
+            write_sample_csv(csv_path, [(101, 1, 10.0, "01/01/2020")])
+            DataLoader(str(csv_path)).load_data()
+
+            # Rewrite the CSV with different data and an mtime safely newer
+            # than the cache's
+            write_sample_csv(csv_path, [
+                (201, 5, 40.0, "01/01/2022"),
+                (202, 2, 30.0, "01/06/2022"),
+            ])
+            future = os.path.getmtime(csv_path.with_suffix('.parquet')) + 10
+            os.utime(csv_path, (future, future))
+
+            df = DataLoader(str(csv_path)).load_data()
+            assert len(df) == 2, f"Expected re-ingested rows, got {len(df)}"
+            assert set(df['product_id']) == {201, 202}, "Stale cache data served"
+
+        print(f"[PASS] Newer CSV triggered re-ingestion ({len(df)} fresh rows)")
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] {str(e)}")
+        return False
+
+
+def test_load_filtered_pushdown():
+    """Test that load_filtered returns the same rows as in-memory filtering."""
+    print("\n" + "="*70)
+    print("TEST 3: load_filtered Predicate Pushdown")
+    print("="*70)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "invoices.csv"
+            write_sample_csv(csv_path, [
+                (101, 2, 10.0, "01/02/2020"),
+                (102, 1, 20.0, "15/06/2021"),
+                (101, 3, 5.0, "31/12/2021"),
+                (103, 4, 8.0, "10/03/2022"),
+            ])
+            loader = DataLoader(str(csv_path))
+            full = loader.load_data()
+
+            filtered = DataLoader(str(csv_path)).load_filtered(
+                product_ids=[101], start_date="2021-01-01"
+            )
+            expected = full[
+                (full['product_id'] == 101)
+                & (full['invoice_date'] >= pd.Timestamp("2021-01-01"))
+            ]
+            assert len(filtered) == len(expected) == 1, \
+                f"Pushdown returned {len(filtered)} rows, expected {len(expected)}"
+            assert filtered.attrs.get('date_sorted') is True, "date_sorted flag missing"
+
+        print(f"[PASS] Pushed-down scan matches in-memory filtering ({len(filtered)} row)")
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] {str(e)}")
+        return False
+
+
+def test_mask_cache_not_shared_across_frames():
+    """Test that a cached filter mask is never applied to a different frame."""
+    print("\n" + "="*70)
+    print("TEST 4: Filter Mask Cache Evicted on Frame Collection")
+    print("="*70)
+
+    try:
+        df = pd.DataFrame({'invoice_year': [2020, 2020, 2021], 'product_id': [1, 2, 3]})
+        assert len(apply_combined_filters(df, years=[2020])) == 2
+        del df
+        gc.collect()
+
+        # Repeatedly allocate same-length frames with the years swapped so
+        # one lands on the recycled id; the old mask must not be reused
+        for _ in range(50):
+            df2 = pd.DataFrame({'invoice_year': [2021, 2021, 2020], 'product_id': [1, 2, 3]})
+            result = apply_combined_filters(df2, years=[2020])
+            assert len(result) == 1 and set(result['invoice_year']) == {2020}, \
+                "Stale mask applied to a different frame"
+            del df2, result
+            gc.collect()
+
+        print(f"[PASS] No stale mask served across 50 recycled-id candidates")
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] {str(e)}")
+        return False
+
+
+def test_kpi_caches_not_shared_across_frames():
+    """Test that cached KPIs and year lists die with their source frame."""
+    print("\n" + "="*70)
+    print("TEST 5: KPI/Year Caches Evicted on Frame Collection")
+    print("="*70)
+
+    try:
+        df = pd.DataFrame({
+            'invoice_year': [2000, 2001, 2002],
+            'qty': [1, 2, 3],
+            'amount': [10.0, 10.0, 10.0],
+            'total_amount': [10.0, 20.0, 30.0],
+        })
+        assert calculate_all_kpis(df)['total_revenue'] == 60.0
+        assert get_available_years(df) == [2000, 2001, 2002]
+        del df
+        gc.collect()
+
+        for _ in range(50):
+            df2 = pd.DataFrame({
+                'invoice_year': [2010, 2011, 2012],
+                'qty': [9, 9, 9],
+                'amount': [66.0, 66.0, 66.0],
+                'total_amount': [198.0, 198.0, 198.0],
+            })
+            kpis = calculate_all_kpis(df2)
+            assert kpis['total_revenue'] == 594.0, "Stale KPIs served"
+            assert get_available_years(df2) == [2010, 2011, 2012], "Stale year list served"
+            del df2, kpis
+            gc.collect()
+
+        print(f"[PASS] No stale KPIs or year lists across 50 recycled-id candidates")
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] {str(e)}")
+        return False
+
+
+def test_yearly_kpi_cache_keyed_on_columns():
+    """Test that the per-year KPI table distinguishes source column names."""
+    print("\n" + "="*70)
+    print("TEST 6: Yearly KPI Cache Keyed on Column Names")
+    print("="*70)
+
+    try:
+        df = pd.DataFrame({
+            'invoice_year': [2020, 2020, 2021],
+            'qty': [1, 2, 3],
+            'amount': [10.0, 10.0, 10.0],
+            'total_amount': [10.0, 20.0, 30.0],
+            'email': ['a@x', 'b@y', 'c@z'],
+            'product_id': [1, 2, 3],
+            'alt_qty': [5, 5, 5],
+            'alt_total': [50.0, 50.0, 50.0],
+        })
+        default = calculate_kpis_for_year(df, 2020)
+        assert default['total_revenue'] == 30.0
+
+        # Same frame, different source columns: must compute a new table
+        alt = calculate_kpis_for_year(
+            df, 2020, qty_column='alt_qty', total_amount_column='alt_total'
+        )
+        assert alt['total_revenue'] == 100.0, \
+            f"Cache served default-column table: {alt['total_revenue']}"
+        assert alt['total_quantity'] == 10, "Wrong quantity column used"
+
+        print(f"[PASS] Default columns: revenue ${default['total_revenue']:,.2f}")
+        print(f"[PASS] Alternate columns: revenue ${alt['total_revenue']:,.2f}")
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] {str(e)}")
+        return False
+
+
+def main():
+    """Run all tests."""
+    print("\n" + "#"*70)
+    print("# CACHING BEHAVIOR - TEST SUITE")
+    print("#"*70)
+
+    results = []
+
+    # Run tests
+    results.append(("Parquet Cache Round-Trip", test_parquet_cache_roundtrip()))
+    results.append(("Stale CSV Invalidates Cache", test_stale_csv_invalidates_cache()))
+    results.append(("load_filtered Pushdown", test_load_filtered_pushdown()))
+    results.append(("Mask Cache Eviction", test_mask_cache_not_shared_across_frames()))
+    results.append(("KPI/Year Cache Eviction", test_kpi_caches_not_shared_across_frames()))
+    results.append(("Yearly KPI Cache Column Key", test_yearly_kpi_cache_keyed_on_columns()))
+
+    # Summary
+    print("\n" + "="*70)
+    print("TEST SUMMARY")
+    print("="*70)
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+    print(f"\nTotal: {passed}/{total} tests passed")
+
+    if passed == total:
+        print("\n*** All tests passed! ***")
+        return 0
+    else:
+        print(f"\n*** {total - passed} test(s) failed ***")
+        return 1
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)